@@ -143,30 +143,42 @@ def _chat_local(message: str | None, session: str) -> None:
         db.get_or_create_user(user_id, name="CLI User")
     channel = "cli"
 
+    # Turns are persisted in the background: always drain those writes (and
+    # any session rotation) before the event loop exits.
+    async def _one_shot() -> str:
+        try:
+            response, _ = await runner.process(user_id, channel, message, session)
+        finally:
+            await runner.shutdown()
+        return response
+
     if message:
-        response, _ = asyncio.run(runner.process(user_id, channel, message, session))
+        response = asyncio.run(_one_shot())
         console.print(f"\n[bold cyan]gbot:[/bold cyan] {response}\n")
     else:
         console.print("[bold]gbot interactive mode[/bold] (type 'exit' or 'quit' to leave)\n")
 
         async def _interactive() -> None:
             sid = session
-            while True:
-                try:
-                    user_input = console.input("[bold blue]You:[/bold blue] ")
-                except (KeyboardInterrupt, EOFError):
-                    console.print("\nBye!")
-                    break
-
-                text = user_input.strip()
-                if not text:
-                    continue
-                if text.lower() in ("exit", "quit"):
-                    console.print("Bye!")
-                    break
-
-                response, sid = await runner.process(user_id, channel, text, sid)
-                console.print(f"\n[bold cyan]gbot:[/bold cyan] {response}\n")
+            try:
+                while True:
+                    try:
+                        user_input = console.input("[bold blue]You:[/bold blue] ")
+                    except (KeyboardInterrupt, EOFError):
+                        console.print("\nBye!")
+                        break
+
+                    text = user_input.strip()
+                    if not text:
+                        continue
+                    if text.lower() in ("exit", "quit"):
+                        console.print("Bye!")
+                        break
+
+                    response, sid = await runner.process(user_id, channel, text, sid)
+                    console.print(f"\n[bold cyan]gbot:[/bold cyan] {response}\n")
+            finally:
+                await runner.shutdown()
 
         asyncio.run(_interactive())
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -10,6 +11,13 @@ from graphbot.core.config.schema import Config
 from graphbot.memory.store import MemoryStore
 
 
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 class ContextBuilder:
     """
     Builds layered system prompt with configurable persona, roles, and token budgets.
@@ -32,6 +40,13 @@ class ContextBuilder:
             workspace=config.workspace_path,
             builtin_dir=Path(__file__).parent / "skills" / "builtin",
         )
+        # Identity is re-resolved only when the template or AGENT.md mtime
+        # changes, or on every call for templates that render {datetime}.
+        # (sources key, identity, dynamic) is replaced as one tuple under the
+        # lock, since shared builders run in several threads.
+        self._identity_lock = threading.Lock()
+        key = self._identity_sources()
+        self._identity_state = (key, *self._resolve_identity())
 
     def build(
         self,
@@ -149,28 +164,47 @@ class ContextBuilder:
     # ── Identity resolution ───────────────────────────────────
 
     def _get_identity(self) -> str:
-        """Get identity prompt.
+        """Get identity prompt, re-resolved when its source files change."""
+        key = self._identity_sources()
+        with self._identity_lock:
+            cached_key, identity, dynamic = self._identity_state
+            if dynamic or key != cached_key:
+                self._identity_state = (key, *self._resolve_identity())
+                identity = self._identity_state[1]
+            return identity
+
+    def _identity_sources(self) -> tuple[int | None, int | None]:
+        """mtimes of the prompt template and AGENT.md (None if missing)."""
+        template = self._template_path()
+        return (
+            _mtime(template) if template else None,
+            _mtime(self.config.workspace_path / "AGENT.md"),
+        )
+
+    def _resolve_identity(self) -> tuple[str, bool]:
+        """Resolve identity prompt and whether it must be re-rendered per call.
 
         Priority: prompt_template file > system_prompt > AGENT.md > persona config.
         """
         # Priority 0: custom prompt template file
         template = self._load_template()
         if template:
-            return self._apply_persona_suffix(template)
+            text, dynamic = template
+            return self._apply_persona_suffix(text), dynamic
 
         # Priority 1: explicit system_prompt in config
         if self.config.assistant.system_prompt:
-            return self._apply_persona_suffix(self.config.assistant.system_prompt)
+            return self._apply_persona_suffix(self.config.assistant.system_prompt), False
 
         # Priority 2: workspace/AGENT.md
         agent_md = self.config.workspace_path / "AGENT.md"
         if agent_md.exists():
             content = agent_md.read_text(encoding="utf-8").strip()
             if content:
-                return self._apply_persona_suffix(content)
+                return self._apply_persona_suffix(content), False
 
         # Priority 3: build from persona config
-        return self._build_persona_prompt()
+        return self._build_persona_prompt(), False
 
     def _build_persona_prompt(self) -> str:
         """Build identity from persona config (fallback when no AGENT.md)."""
@@ -197,17 +231,22 @@ class ContextBuilder:
         )
         return base + suffix
 
-    def _load_template(self) -> str | None:
-        """Load custom prompt template file if configured."""
+    def _template_path(self) -> Path | None:
         path = self.config.assistant.prompt_template
-        if not path:
-            return None
-        template_path = Path(path).expanduser().resolve()
-        if not template_path.exists():
+        return Path(path).expanduser().resolve() if path else None
+
+    def _load_template(self) -> tuple[str, bool] | None:
+        """Load custom prompt template file if configured.
+
+        Returns (rendered text, whether it renders ``{datetime}``).
+        """
+        template_path = self._template_path()
+        if template_path is None or not template_path.exists():
             return None
         raw = template_path.read_text(encoding="utf-8").strip()
         if not raw:
             return None
+        dynamic = "{datetime}" in raw
         # Render simple {variable} placeholders
         persona = self.config.assistant.persona
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -218,9 +257,9 @@ class ContextBuilder:
             "datetime": now,
         }
         try:
-            return raw.format_map(variables)
+            return raw.format_map(variables), dynamic
         except (KeyError, ValueError):
-            return raw
+            return raw, dynamic
 
     # ── Role resolution ───────────────────────────────────────
 
@@ -316,3 +355,20 @@ class ContextBuilder:
         if len(text) <= char_limit:
             return text
         return text[:char_limit] + "\n\n[...truncated]"
+
+
+# Shared builders keyed by (config, db) identity. Each builder holds strong
+# references to both objects, so their ids cannot be reused while cached.
+_BUILDERS: dict[tuple[int, int], ContextBuilder] = {}
+_MAX_BUILDERS = 16
+
+
+def get_context_builder(config: Config, db: MemoryStore) -> ContextBuilder:
+    """Return a shared ContextBuilder for this (config, db) pair."""
+    key = (id(config), id(db))
+    builder = _BUILDERS.get(key)
+    if builder is None:
+        if len(_BUILDERS) >= _MAX_BUILDERS:
+            _BUILDERS.pop(next(iter(_BUILDERS)))
+        builder = _BUILDERS[key] = ContextBuilder(config, db)
+    return builder
@@ -200,11 +200,26 @@ class DelegationPlanner:
 
     def __init__(self, config: Config, tool_catalog: str) -> None:
         self.config = config
-        self.tool_catalog = tool_catalog
         deleg = config.background.delegation
         self.model = deleg.model or config.assistant.model
         self.temperature = deleg.temperature
         self._extra_examples = self._build_extra_examples(deleg.examples)
+        self.tool_catalog = tool_catalog
+
+    @property
+    def tool_catalog(self) -> str:
+        """Tool catalog injected into the planner prompt."""
+        return self._tool_catalog
+
+    @tool_catalog.setter
+    def tool_catalog(self, value: str) -> None:
+        # The system prompt only depends on the catalog and the config
+        # examples, so render it once here instead of on every plan().
+        self._tool_catalog = value
+        self._system_prompt = _PLANNER_PROMPT.format(
+            tool_catalog=value,
+            extra_examples=self._extra_examples,
+        )
 
     @staticmethod
     def _build_extra_examples(examples: list[str]) -> str:
@@ -224,12 +239,8 @@ class DelegationPlanner:
         dict
             Plan with execution type, processor type, and relevant config.
         """
-        system = _PLANNER_PROMPT.format(
-            tool_catalog=self.tool_catalog,
-            extra_examples=self._extra_examples,
-        )
         messages = [
-            {"role": "system", "content": system},
+            {"role": "system", "content": self._system_prompt},
             {"role": "user", "content": f"Task: {task}"},
         ]
         logger.debug(f"Planner LLM call: model={self.model}, task={task[:60]}")
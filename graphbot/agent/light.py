@@ -4,16 +4,23 @@ from __future__ import annotations
 
 from typing import Any
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import HumanMessage, ToolMessage
 from langgraph.graph import StateGraph, START, END
 from loguru import logger
 
-from graphbot.agent.nodes import should_continue, _langchain_to_dict, _build_tool_definitions
+from graphbot.agent.nodes import (
+    achat_single_flight, respond, should_continue, _langchain_to_dict,
+    _build_tool_definitions, _tool_content,
+)
 from graphbot.agent.state import AgentState
+from graphbot.agent.tools.memo import IdentityMemo
 from graphbot.core.config.schema import Config
-from graphbot.core.providers import litellm as llm_provider
 from graphbot.core.providers.litellm import setup_provider
 
+# Compiled graphs shared across instances, keyed by config and tool identity
+# plus the model name
+_GRAPHS = IdentityMemo(max_size=32)
+
 
 class LightAgent:
     """Lightweight agent for background tasks (cron jobs, subagents).
@@ -48,7 +55,7 @@ class LightAgent:
         self.tools = tools or []
         self.model = model or config.assistant.model
         setup_provider(config)
-        self._graph = self._compile()
+        self._graph = _GRAPHS.get((config, *self.tools), self._compile, extra=self.model)
 
     async def run(self, message: str) -> tuple[str, int]:
         """Run a single task and return (response, token_count).
@@ -79,29 +86,29 @@ class LightAgent:
                 "user_id": "system",
                 "session_id": "",
                 "channel": "background",
+                "role": "system",
+                "allowed_tools": None,
+                "context_layers": None,
+                "skip_context": True,
                 "iteration": 0,
                 "token_count": 0,
+                "called_tools": set(),
+                "final_response": "",
             },
             config={"recursion_limit": 50},
         )
-        response = self._extract(state)
-        tokens = state.get("token_count", 0)
-        called = self._extract_called_tools(state)
+        response = state["final_response"]
+        tokens = state["token_count"]
+        called = state["called_tools"]
         logger.debug(f"LightAgent done: {len(response)} chars, {tokens} tokens")
         return response, tokens, called
 
-    @staticmethod
-    def _extract_called_tools(state: dict) -> set[str]:
-        """Extract set of tool names called during execution."""
-        names: set[str] = set()
-        for msg in state.get("messages", []):
-            if isinstance(msg, AIMessage) and msg.tool_calls:
-                for tc in msg.tool_calls:
-                    names.add(tc["name"])
-        return names
-
     def _compile(self) -> StateGraph:
-        """Build minimal graph: reason -> execute_tools -> respond."""
+        """Build minimal graph: reason -> execute_tools -> respond.
+
+        The graph must not close over the system prompt (it is passed via
+        state), since compiled graphs are shared between instances.
+        """
         tool_defs = _build_tool_definitions(self.tools) if self.tools else None
         tool_map = {t.name: t for t in self.tools} if self.tools else {}
         model = self.model
@@ -111,35 +118,38 @@ class LightAgent:
 
         async def reason(state: AgentState) -> dict[str, Any]:
             """Call LLM with system prompt + messages."""
+            iteration = state["iteration"]
             messages = [{"role": "system", "content": state["system_prompt"]}]
-            for msg in state["messages"]:
-                messages.append(_langchain_to_dict(msg))
+            messages.extend(map(_langchain_to_dict, state["messages"]))
 
             # Force final response when nearing iteration limit
             use_tools = tool_defs
-            if state["iteration"] >= max_tool_iterations:
+            if iteration >= max_tool_iterations:
                 use_tools = None
                 messages.append({
                     "role": "user",
                     "content": "Summarize your findings now. Do not make any more tool calls.",
                 })
 
-            ai_message = await llm_provider.achat(
+            ai_message = await achat_single_flight(
                 messages=messages,
                 model=model,
                 tools=use_tools,
                 temperature=config.assistant.temperature,
                 api_base=config.get_api_base(),
             )
-            return {
+            update: dict[str, Any] = {
                 "messages": [ai_message],
-                "iteration": state["iteration"] + 1,
+                "iteration": iteration + 1,
             }
+            if ai_message.tool_calls:
+                update["called_tools"] = {tc["name"] for tc in ai_message.tool_calls}
+            elif ai_message.content:
+                update["final_response"] = ai_message.content
+            return update
 
         async def execute_tools(state: AgentState) -> dict[str, Any]:
             """Execute tool calls from the last AI message."""
-            from langchain_core.messages import ToolMessage
-
             last_msg = state["messages"][-1]
             results = []
             for call in last_msg.tool_calls:
@@ -152,17 +162,10 @@ class LightAgent:
                     except Exception as e:
                         result = f"Tool error: {e}"
                 results.append(
-                    ToolMessage(content=str(result), tool_call_id=call["id"])
+                    ToolMessage(content=_tool_content(result), tool_call_id=call["id"])
                 )
             return {"messages": results}
 
-        async def respond(state: AgentState) -> dict[str, Any]:
-            """Calculate token count from last response."""
-            last_msg = state["messages"][-1]
-            usage = getattr(last_msg, "response_metadata", {}).get("usage", {})
-            total = usage.get("total_tokens", 0)
-            return {"token_count": state["token_count"] + total}
-
         graph = StateGraph(AgentState)
         graph.add_node("reason", reason)
         graph.add_node("execute_tools", execute_tools)
@@ -173,11 +176,3 @@ class LightAgent:
         graph.add_edge("execute_tools", "reason")
         graph.add_edge("respond", END)
         return graph.compile()
-
-    @staticmethod
-    def _extract(state: dict) -> str:
-        """Get final assistant text from state."""
-        for msg in reversed(state["messages"]):
-            if isinstance(msg, AIMessage) and msg.content and not msg.tool_calls:
-                return msg.content
-        return ""
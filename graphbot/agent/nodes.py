@@ -2,27 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from collections.abc import Callable
 from typing import Any
 
-from langchain_core.messages import AIMessage, SystemMessage
+import orjson
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from loguru import logger
 
 from graphbot.agent.state import AgentState
 from graphbot.core.config.schema import Config
 from graphbot.core.providers import litellm as llm_provider
-from graphbot.agent.context import ContextBuilder
+from graphbot.agent.context import get_context_builder
 from graphbot.memory.store import MemoryStore
 
 
+# In-flight LLM calls keyed by request hash (see achat_single_flight)
+_inflight: dict[str, asyncio.Future] = {}
+
+# State fields auto-injected into tool args when the tool schema accepts them
+_INJECTABLE_FIELDS = frozenset({"channel"})
+
+
 def make_nodes(config: Config, db: MemoryStore, tools: list | None = None):
     """
     Create node functions closed over config, db, and tools.
 
     Returns dict of {node_name: callable} for graph registration.
     """
-    ctx_builder = ContextBuilder(config, db)
+    ctx_builder = get_context_builder(config, db)
     tool_defs = _build_tool_definitions(tools) if tools else None
     tool_map = {t.name: t for t in tools} if tools else {}
+    tool_inject, tool_required = _build_tool_fields(tools) if tools else ({}, {})
+    # allowed_tools set -> filtered tool definitions (one entry per role in practice)
+    filtered_defs_cache: dict[frozenset[str], list[dict[str, Any]]] = {}
 
     async def load_context(state: AgentState) -> dict[str, Any]:
         """Build system prompt from SQLite + workspace.
@@ -31,15 +45,19 @@ def make_nodes(config: Config, db: MemoryStore, tools: list | None = None):
         (no user context, memory, skills, etc.). Used by background tasks.
         Context layers can be restricted via RBAC (state["context_layers"]).
         """
-        if state.get("skip_context"):
+        user_id = state["user_id"]
+        if state["skip_context"]:
             prompt = ctx_builder._get_identity()
-            logger.debug(f"Lightweight context (identity only) for user {state['user_id']}")
+            logger.debug(f"Lightweight context (identity only) for user {user_id}")
         else:
-            layers = state.get("context_layers")
-            prompt = ctx_builder.build(state["user_id"], context_layers=layers)
+            layers = state["context_layers"]
+            # build() hits SQLite and skill files — keep it off the event loop
+            prompt = await asyncio.to_thread(
+                ctx_builder.build, user_id, context_layers=layers,
+            )
             logger.debug(
-                f"Context built for user {state['user_id']} "
-                f"(role={state.get('role', '?')}, layers={len(layers) if layers else 'all'})"
+                f"Context built for user {user_id} "
+                f"(role={state['role']}, layers={len(layers) if layers else 'all'})"
             )
         return {"system_prompt": prompt}
 
@@ -47,19 +65,21 @@ def make_nodes(config: Config, db: MemoryStore, tools: list | None = None):
         """Call LLM with messages + tools (filtered by role)."""
         # Build messages for litellm (dict format)
         messages = [{"role": "system", "content": state["system_prompt"]}]
-        for msg in state["messages"]:
-            messages.append(_langchain_to_dict(msg))
+        messages.extend(map(_langchain_to_dict, state["messages"]))
 
         # RBAC: filter tool definitions by allowed_tools
-        allowed = state.get("allowed_tools")
+        allowed = state["allowed_tools"]
         if allowed is not None and tool_defs:
-            filtered_defs = [
-                d for d in tool_defs if d["function"]["name"] in allowed
-            ]
+            key = allowed if isinstance(allowed, frozenset) else frozenset(allowed)
+            filtered_defs = filtered_defs_cache.get(key)
+            if filtered_defs is None:
+                filtered_defs = filtered_defs_cache[key] = [
+                    d for d in tool_defs if d["function"]["name"] in allowed
+                ]
         else:
             filtered_defs = tool_defs
 
-        ai_message = await llm_provider.achat(
+        ai_message = await achat_single_flight(
             messages=messages,
             model=config.assistant.model,
             tools=filtered_defs or None,
@@ -83,78 +103,66 @@ def make_nodes(config: Config, db: MemoryStore, tools: list | None = None):
 
     async def execute_tools(state: AgentState) -> dict[str, Any]:
         """Execute tool calls from the last AI message (with RBAC guard)."""
-        from langchain_core.messages import ToolMessage
-
         last_msg = state["messages"][-1]
         results = []
-        allowed = state.get("allowed_tools")
+        allowed = state["allowed_tools"]
+        role = state["role"]
+        channel = state["channel"]
 
         for call in last_msg.tool_calls:
             # RBAC guard: reject unauthorized tool calls
             if allowed is not None and call["name"] not in allowed:
                 result = (
                     f"Permission denied: '{call['name']}' is not available "
-                    f"for role '{state.get('role', 'unknown')}'."
+                    f"for role '{role}'."
                 )
                 logger.warning(
                     f"RBAC denied: user={state['user_id']}, "
-                    f"role={state.get('role')}, tool={call['name']}"
+                    f"role={role}, tool={call['name']}"
                 )
             elif (tool := tool_map.get(call["name"])) is None:
                 result = f"Tool '{call['name']}' not found"
                 logger.warning(f"Tool not found: {call['name']}")
             else:
                 try:
-                    args = call["args"].copy()
+                    # Copy-on-write: call["args"] is only copied when changed
+                    args = call["args"]
                     # Clean up malformed LLM args (e.g. {"raw": "..."})
-                    args.pop("raw", None)
+                    if "raw" in args:
+                        args = {k: v for k, v in args.items() if k != "raw"}
                     # Inject state context into tools that accept these params
-                    tool_fields = set(tool.args_schema.model_fields) if tool.args_schema else set()
-                    if "channel" in tool_fields and not args.get("channel"):
-                        args["channel"] = state["channel"]
-                        logger.debug(
-                            f"Channel inject: tool={call['name']}, "
-                            f"→ {state['channel']!r}"
-                        )
+                    if "channel" in tool_inject[call["name"]] and not args.get("channel"):
+                        args = {**args, "channel": channel}
+                        logger.debug("Channel inject: tool={}, → {!r}", call["name"], channel)
                     # Pre-validate: detect empty args for tools with required params
-                    auto_keys = {"channel"}
-                    user_args = {k: v for k, v in args.items() if k not in auto_keys}
-                    required = set()
-                    if tool.args_schema:
-                        for k, f in tool.args_schema.model_fields.items():
-                            if k not in auto_keys and f.is_required():
-                                required.add(k)
+                    required = tool_required[call["name"]]
+                    user_args = [k for k in args if k not in _INJECTABLE_FIELDS]
                     if required and not user_args:
-                        param_hints = ", ".join(sorted(required))
-                        example_args = ", ".join(
-                            f'{k}="..."' for k in sorted(required)
-                        )
+                        param_hints = ", ".join(required)
+                        example_args = ", ".join(f'{k}="..."' for k in required)
                         result = (
                             f"Error: {call['name']} requires: {param_hints}. "
                             f"Example: {call['name']}({example_args})"
                         )
                         logger.warning(f"Empty args: {call['name']} needs {required}")
                     else:
-                        logger.debug(f"Executing tool: {call['name']}({args})")
+                        logger.debug("Executing tool: {}({})", call["name"], args)
                         result = await tool.ainvoke(args)
-                        logger.debug(f"Tool result: {call['name']} → {str(result)[:100]}")
+                        logger.opt(lazy=True).debug(
+                            "Tool result: {} → {}",
+                            lambda name=call["name"]: name,
+                            lambda result=result: str(result)[:100],
+                        )
                 except Exception as e:
                     result = f"Tool error: {e}"
                     logger.error(f"Tool error: {call['name']} → {e}")
 
             results.append(
-                ToolMessage(content=str(result), tool_call_id=call["id"])
+                ToolMessage(content=_tool_content(result), tool_call_id=call["id"])
             )
 
         return {"messages": results}
 
-    async def respond(state: AgentState) -> dict[str, Any]:
-        """Calculate token count from last response."""
-        last_msg = state["messages"][-1]
-        usage = getattr(last_msg, "response_metadata", {}).get("usage", {})
-        total = usage.get("total_tokens", 0)
-        return {"token_count": state["token_count"] + total}
-
     return {
         "load_context": load_context,
         "reason": reason,
@@ -163,6 +171,52 @@ def make_nodes(config: Config, db: MemoryStore, tools: list | None = None):
     }
 
 
+async def respond(state: AgentState) -> dict[str, Any]:
+    """Calculate token count from last response (shared by all graphs)."""
+    metadata = getattr(state["messages"][-1], "response_metadata", None)
+    usage = metadata.get("usage") if metadata else None
+    total = usage.get("total_tokens", 0) if usage else 0
+    return {"token_count": state["token_count"] + total}
+
+
+async def achat_single_flight(**kwargs: Any) -> AIMessage:
+    """Call llm_provider.achat, coalescing identical concurrent requests.
+
+    The first caller for a given request issues it; identical requests
+    arriving while it is in flight await the same result instead of
+    hitting the provider again (e.g. many monitors firing on one cron tick).
+    Each waiter gets its own copy of the message, so callers (and LangGraph
+    assigning message ids) never mutate a shared object.
+    """
+    key = hashlib.blake2b(orjson.dumps(kwargs, default=str), digest_size=16).hexdigest()
+    fut = _inflight.get(key)
+    if fut is not None:
+        try:
+            return (await asyncio.shield(fut)).model_copy(deep=True)
+        except asyncio.CancelledError:
+            # Leader was cancelled, not us — issue our own call below
+            if not fut.cancelled() or asyncio.current_task().cancelling():
+                raise
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await llm_provider.achat(**kwargs)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved when nobody else is waiting
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+
 def should_continue(state: AgentState) -> str:
     """Conditional edge: after reason, go to tools or respond."""
     last_msg = state["messages"][-1]
@@ -179,38 +233,78 @@ def should_continue(state: AgentState) -> str:
     return "respond"
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON (non-JSON values fall back to str)."""
+    return orjson.dumps(obj, default=str).decode()
+
+
+def _tool_content(result: Any) -> str:
+    """Tool result -> ToolMessage content (dict/list results as JSON)."""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, (dict, list)):
+        return _dumps(result)
+    return str(result)
+
+
+def _human_to_dict(msg: HumanMessage) -> dict[str, Any]:
+    return {"role": "user", "content": msg.content}
+
+
+def _ai_to_dict(msg: AIMessage) -> dict[str, Any]:
+    d: dict[str, Any] = {"role": "assistant", "content": msg.content}
+    # Preserve reasoning_content for thinking models
+    reasoning = msg.additional_kwargs.get("reasoning_content")
+    if reasoning:
+        d["reasoning_content"] = reasoning
+    if msg.tool_calls:
+        d["tool_calls"] = [
+            {
+                "id": tc["id"],
+                "type": "function",
+                "function": {"name": tc["name"], "arguments": _dumps(tc["args"])},
+            }
+            for tc in msg.tool_calls
+        ]
+    return d
+
+
+def _tool_to_dict(msg: ToolMessage) -> dict[str, Any]:
+    return {
+        "role": "tool",
+        "tool_call_id": msg.tool_call_id,
+        "content": msg.content,
+    }
+
+
+def _system_to_dict(msg: SystemMessage) -> dict[str, Any]:
+    return {"role": "system", "content": msg.content}
+
+
+def _default_to_dict(msg: Any) -> dict[str, Any]:
+    return {"role": "user", "content": str(msg.content)}
+
+
+# Exact message type -> converter. Subclasses (e.g. AIMessageChunk) are
+# resolved through the MRO on first sight and cached here.
+_TO_DICT: dict[type, Callable[[Any], dict[str, Any]]] = {
+    HumanMessage: _human_to_dict,
+    AIMessage: _ai_to_dict,
+    ToolMessage: _tool_to_dict,
+    SystemMessage: _system_to_dict,
+}
+
+
 def _langchain_to_dict(msg: Any) -> dict[str, Any]:
     """Convert LangChain message to dict for litellm."""
-    from langchain_core.messages import HumanMessage, ToolMessage
-
-    if isinstance(msg, HumanMessage):
-        return {"role": "user", "content": msg.content}
-    elif isinstance(msg, AIMessage):
-        d: dict[str, Any] = {"role": "assistant", "content": msg.content}
-        # Preserve reasoning_content for thinking models
-        reasoning = msg.additional_kwargs.get("reasoning_content")
-        if reasoning:
-            d["reasoning_content"] = reasoning
-        if msg.tool_calls:
-            d["tool_calls"] = [
-                {
-                    "id": tc["id"],
-                    "type": "function",
-                    "function": {"name": tc["name"], "arguments": str(tc["args"])},
-                }
-                for tc in msg.tool_calls
-            ]
-        return d
-    elif isinstance(msg, ToolMessage):
-        return {
-            "role": "tool",
-            "tool_call_id": msg.tool_call_id,
-            "content": msg.content,
-        }
-    elif isinstance(msg, SystemMessage):
-        return {"role": "system", "content": msg.content}
-    else:
-        return {"role": "user", "content": str(msg.content)}
+    converter = _TO_DICT.get(type(msg))
+    if converter is None:
+        converter = next(
+            (_TO_DICT[t] for t in type(msg).__mro__ if t in _TO_DICT),
+            _default_to_dict,
+        )
+        _TO_DICT[type(msg)] = converter
+    return converter(msg)
 
 
 def _build_tool_definitions(tools: list) -> list[dict[str, Any]]:
@@ -221,3 +315,24 @@ def _build_tool_definitions(tools: list) -> list[dict[str, Any]]:
         {"type": "function", "function": convert_to_openai_function(t)}
         for t in tools
     ]
+
+
+def _build_tool_fields(
+    tools: list,
+) -> tuple[dict[str, frozenset[str]], dict[str, tuple[str, ...]]]:
+    """Precompute per-tool schema metadata used by execute_tools.
+
+    Returns (injectable, required):
+      - injectable: tool name -> injectable state fields the tool accepts
+      - required: tool name -> sorted required params (excluding injectable)
+    """
+    injectable: dict[str, frozenset[str]] = {}
+    required: dict[str, tuple[str, ...]] = {}
+    for t in tools:
+        fields = t.args_schema.model_fields if t.args_schema else {}
+        injectable[t.name] = _INJECTABLE_FIELDS.intersection(fields)
+        required[t.name] = tuple(sorted(
+            k for k, f in fields.items()
+            if k not in _INJECTABLE_FIELDS and f.is_required()
+        ))
+    return injectable, required
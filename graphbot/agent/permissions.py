@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -11,35 +13,99 @@ from loguru import logger
 if TYPE_CHECKING:
     from graphbot.agent.tools import ToolRegistry
 
+# libyaml C loader when available (much faster), pure-Python fallback
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_MINIMAL_LAYERS = frozenset({"identity", "runtime", "role"})
+
+# How often (seconds) roles.yaml is stat()-ed for changes
+_RELOAD_INTERVAL = 5.0
+
+# Raw roles.yaml + per-role resolution. Rebuilt (and swapped in whole)
+# only when the file's mtime changes; reset_cache() clears everything.
 _ROLES_DATA: dict[str, Any] | None = None
+_ROLES_PATH: Path | None = None
+_ROLES_MTIME: int | None = None
+_ROLES_CHECKED = 0.0
+_ROLE_GROUPS: dict[str, tuple[str, ...]] = {}
+_ROLE_TOOLS: dict[str, frozenset[str]] = {}
+_ROLE_LAYERS: dict[str, frozenset[str]] = {}
+_ROLE_MAX_SESSIONS: dict[str, int] = {}
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
 
 
 def _load_roles_yaml(path: str | Path | None = None) -> dict[str, Any]:
-    """Load and cache roles.yaml. Returns empty dict if file missing."""
-    global _ROLES_DATA
-    if _ROLES_DATA is not None:
-        return _ROLES_DATA
+    """Load and cache roles.yaml. Returns empty dict if file missing.
 
-    if path is None:
-        path = Path("roles.yaml")
+    The first loaded path is kept; it is re-checked at most every
+    _RELOAD_INTERVAL seconds and re-parsed only when its mtime changes.
+    """
+    global _ROLES_DATA, _ROLES_PATH, _ROLES_MTIME, _ROLES_CHECKED
+    now = time.monotonic()
+    if _ROLES_DATA is not None:
+        if now - _ROLES_CHECKED < _RELOAD_INTERVAL:
+            return _ROLES_DATA
+        _ROLES_CHECKED = now
+        if _mtime(_ROLES_PATH) == _ROLES_MTIME:
+            return _ROLES_DATA
+        logger.info(f"roles.yaml changed, reloading from {_ROLES_PATH}")
     else:
-        path = Path(path)
+        _ROLES_PATH = Path("roles.yaml") if path is None else Path(path)
+        _ROLES_CHECKED = now
 
-    if not path.exists():
+    path = _ROLES_PATH
+    _ROLES_MTIME = _mtime(path)
+    if _ROLES_MTIME is None:
         logger.warning(f"roles.yaml not found at {path}, RBAC disabled (all tools allowed)")
+        _resolve_roles({})
         _ROLES_DATA = {}
         return _ROLES_DATA
 
     with open(path, encoding="utf-8") as f:
-        _ROLES_DATA = yaml.safe_load(f) or {}
-    logger.info(f"Loaded roles.yaml: {list((_ROLES_DATA.get('roles') or {}).keys())} roles")
+        data = yaml.load(f, Loader=_YamlLoader) or {}
+    _resolve_roles(data)
+    _ROLES_DATA = data
+    logger.info(f"Loaded roles.yaml: {list((data.get('roles') or {}).keys())} roles")
     return _ROLES_DATA
 
 
+def _resolve_roles(data: dict[str, Any]) -> None:
+    """Precompute per-role groups, legacy tool sets, layers and session limits."""
+    global _ROLE_GROUPS, _ROLE_TOOLS, _ROLE_LAYERS, _ROLE_MAX_SESSIONS
+    groups_by_role: dict[str, tuple[str, ...]] = {}
+    tools: dict[str, frozenset[str]] = {}
+    layers: dict[str, frozenset[str]] = {}
+    max_sessions: dict[str, int] = {}
+    legacy_groups = data.get("tool_groups") or {}
+    for role, role_def in (data.get("roles") or {}).items():
+        role_def = role_def or {}
+        groups = tuple(
+            sys.intern(g) if isinstance(g, str) else g
+            for g in role_def.get("tool_groups") or []
+        )
+        groups_by_role[role] = groups
+        tools[role] = frozenset(
+            name for g in groups for name in legacy_groups.get(g) or []
+        )
+        layers[role] = frozenset(role_def.get("context_layers") or [])
+        max_sessions[role] = role_def.get("max_sessions", 0)
+    _ROLE_GROUPS, _ROLE_TOOLS = groups_by_role, tools
+    _ROLE_LAYERS, _ROLE_MAX_SESSIONS = layers, max_sessions
+
+
 def reset_cache() -> None:
     """Clear cached roles data (for testing)."""
-    global _ROLES_DATA
+    global _ROLES_DATA, _ROLES_PATH, _ROLES_MTIME
     _ROLES_DATA = None
+    _ROLES_PATH = None
+    _ROLES_MTIME = None
+    _resolve_roles({})
 
 
 def get_default_role(path: str | Path | None = None) -> str:
@@ -52,7 +118,7 @@ def get_allowed_tools(
     role: str,
     registry: ToolRegistry | None = None,
     path: str | Path | None = None,
-) -> set[str] | None:
+) -> frozenset[str] | None:
     """Resolve allowed tool names for a role.
 
     Parameters
@@ -67,64 +133,43 @@ def get_allowed_tools(
 
     Returns
     -------
-    set[str] | None
+    frozenset[str] | None
         Set of allowed tool names, or None if RBAC is disabled
         (roles.yaml missing -> no filtering).
     """
-    data = _load_roles_yaml(path)
-    if not data:
+    if not _load_roles_yaml(path):
         return None  # RBAC disabled — allow all
 
-    roles = data.get("roles", {})
-    role_def = roles.get(role)
-    if role_def is None:
+    groups = _ROLE_GROUPS.get(role)
+    if groups is None:
         logger.warning(f"Unknown role '{role}', denying all tools")
-        return set()
-
-    groups = role_def.get("tool_groups", [])
+        return frozenset()
 
     # Registry-based resolution (new approach)
     if registry is not None:
         return registry.get_tools_for_groups(groups)
 
-    # Legacy fallback: resolve from roles.yaml tool_groups section
-    tool_groups = data.get("tool_groups", {})
-    allowed: set[str] = set()
-    for group_name in groups:
-        tools_in_group = tool_groups.get(group_name, [])
-        allowed.update(tools_in_group)
-    return allowed
+    # Legacy fallback: resolved from roles.yaml tool_groups section at load
+    return _ROLE_TOOLS[role]
 
 
-def get_context_layers(role: str, path: str | Path | None = None) -> set[str] | None:
+def get_context_layers(role: str, path: str | Path | None = None) -> frozenset[str] | None:
     """Resolve allowed context layers for a role.
 
     Returns
     -------
-    set[str] | None
+    frozenset[str] | None
         Set of allowed layer names, or None if RBAC is disabled.
     """
-    data = _load_roles_yaml(path)
-    if not data:
+    if not _load_roles_yaml(path):
         return None  # RBAC disabled — all layers
 
-    roles = data.get("roles", {})
-    role_def = roles.get(role)
-    if role_def is None:
-        return {"identity", "runtime", "role"}  # minimal fallback
-
-    return set(role_def.get("context_layers", []))
+    return _ROLE_LAYERS.get(role, _MINIMAL_LAYERS)
 
 
 def get_max_sessions(role: str, path: str | Path | None = None) -> int:
     """Get max concurrent sessions for a role. 0 = unlimited."""
-    data = _load_roles_yaml(path)
-    if not data:
+    if not _load_roles_yaml(path):
         return 0
 
-    roles = data.get("roles", {})
-    role_def = roles.get(role)
-    if role_def is None:
-        return 1  # unknown role → restrictive
-
-    return role_def.get("max_sessions", 0)
+    return _ROLE_MAX_SESSIONS.get(role, 1)  # unknown role → restrictive
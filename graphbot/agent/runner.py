@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from collections import OrderedDict
 
+import orjson
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from loguru import logger
 
@@ -14,6 +16,59 @@ from graphbot.core.config.schema import Config
 from graphbot.core.providers.litellm import aextract_facts, asummarize, setup_provider
 from graphbot.memory.store import MemoryStore
 
+_HISTORY_CACHE_MAX = 128
+# Background turn writes: tries before a turn is logged as lost
+_PERSIST_ATTEMPTS = 3
+_PERSIST_RETRY_DELAY = 0.2
+
+# Exact message type → stored role (subclasses resolved by _row_role)
+_ROW_ROLES: dict[type, str] = {
+    HumanMessage: "user",
+    AIMessage: "assistant",
+    ToolMessage: "tool",
+}
+
+
+def _row_role(msg) -> str | None:
+    for cls, role in _ROW_ROLES.items():
+        if isinstance(msg, cls):
+            return role
+    return None
+
+
+def _encode_tool_calls(tool_calls: list[dict]) -> str:
+    """Compact JSON for the tool_calls column.
+
+    The constant ``"type": "tool_call"`` marker is dropped; AIMessage adds it
+    back when history is loaded.
+    """
+    return orjson.dumps(
+        [{k: v for k, v in call.items() if k != "type"} for call in tool_calls]
+    ).decode()
+
+
+def _ai_from_row(content: str | None, tool_calls: str | None, _tc_id: str | None) -> AIMessage:
+    tc = None
+    if tool_calls:
+        try:
+            tc = orjson.loads(tool_calls)
+        except orjson.JSONDecodeError:
+            tc = None
+    return AIMessage(content=content or "", tool_calls=tc or [])
+
+
+_SUMMARY_ROLES = frozenset({"user", "assistant"})
+
+# Stored role → LangChain message builder, called with
+# (content, tool_calls, tool_call_id); unknown roles are skipped
+_HISTORY_BUILDERS = {
+    "user": lambda content, _tc, _tc_id: HumanMessage(content=content or ""),
+    "assistant": _ai_from_row,
+    "tool": lambda content, _tc, tc_id: ToolMessage(
+        content=content or "", tool_call_id=tc_id or "",
+    ),
+}
+
 
 class GraphRunner:
     """
@@ -23,8 +78,12 @@ class GraphRunner:
         1. Find/create session (SQLite)
         2. Load history (SQLite → LangChain messages)
         3. graph.ainvoke(state) — stateless, no checkpoint
-        4. Save new messages (LangGraph → SQLite)
+        4. Save new messages (LangGraph → SQLite, one transaction)
         5. Check token limit → summarize & rotate if needed
+
+    Steps 4-5 run in a background task after the reply is returned; call
+    ``flush(session_id)`` before reading a session's rows directly, and
+    ``shutdown()`` on exit.
     """
 
     def __init__(
@@ -47,6 +106,13 @@ class GraphRunner:
         self.tools = self.registry.get_all_tools()
         setup_provider(config)
         self._graph = create_graph(config, db, self.tools)
+        # Per-request defaults; process() copies and fills in the rest
+        self._state_template = {"iteration": 0, "token_count": 0, "skip_context": False}
+        # In-flight persistence tasks (see _persist_turn), latest per session
+        self._pending: set[asyncio.Task] = set()
+        self._persisting: dict[str, asyncio.Task] = {}
+        # session_id → materialized LangChain history (LRU)
+        self._history_cache: OrderedDict[str, list] = OrderedDict()
 
     async def process(
         self,
@@ -77,8 +143,17 @@ class GraphRunner:
         tuple[str, str]
             (assistant_response, session_id).
         """
-        # 0. RBAC — resolve user role and permissions
-        user = self.db.get_user(user_id)
+        # 0. User + session lookups are independent reads: run them off the
+        #    event loop concurrently (the active session is only used for
+        #    single-session roles, but is cheap to fetch alongside the user)
+        user, session_row = await asyncio.gather(
+            asyncio.to_thread(self.db.get_user, user_id),
+            asyncio.to_thread(self.db.get_active_session, user_id)
+            if session_id is None
+            else asyncio.to_thread(self.db.get_session, session_id),
+        )
+
+        # RBAC — resolve user role and permissions
         role = (user.get("role") or "guest") if user else "guest"
         allowed_tools = get_allowed_tools(role, registry=self.registry)
         context_layers = get_context_layers(role)
@@ -88,98 +163,190 @@ class GraphRunner:
         max_sess = get_max_sessions(role)
         if session_id is None:
             if max_sess == 1:
-                active = self.db.get_active_session(user_id)
                 session_id = (
-                    active["session_id"] if active
+                    session_row["session_id"] if session_row
                     else self.db.create_session(user_id, channel)
                 )
             else:
                 session_id = self.db.create_session(user_id, channel)
         else:
-            existing = self.db.get_session(session_id)
-            if not existing:
+            if not session_row:
                 self.db.create_session(user_id, channel, session_id=session_id)
-            elif existing.get("ended_at") is not None:
+            elif session_row.get("ended_at") is not None:
                 logger.info(
                     f"Session {session_id} is closed, creating new session"
                 )
                 session_id = self.db.create_session(user_id, channel)
 
-        # 2. Load history → LangChain messages
-        history = self._load_history(session_id)
+        # The previous turn of this session may still be persisting, and may
+        # rotate (end) the session once written: wait, then re-check.
+        if session_id in self._persisting:
+            await self.flush(session_id)
+            row = await asyncio.to_thread(self.db.get_session, session_id)
+            if row and row.get("ended_at") is not None:
+                logger.info(
+                    f"Session {session_id} was closed by rotation, creating new session"
+                )
+                session_id = self.db.create_session(user_id, channel)
+
+        # 2. Load history → LangChain messages (cached per session)
+        history = await self._get_history(session_id)
 
         # 3. Run graph
-        state = await self._graph.ainvoke(
-            {
-                "user_id": user_id,
-                "session_id": session_id,
-                "channel": channel,
-                "role": role,
-                "allowed_tools": allowed_tools,
-                "context_layers": context_layers,
-                "messages": history + [HumanMessage(content=message)],
-                "iteration": 0,
-                "token_count": 0,
-                "skip_context": skip_context,
-            }
+        state_in = self._state_template.copy()
+        state_in.update(
+            user_id=user_id,
+            session_id=session_id,
+            channel=channel,
+            role=role,
+            allowed_tools=allowed_tools,
+            context_layers=context_layers,
+            messages=history + [HumanMessage(content=message)],
+            skip_context=skip_context,
         )
+        state = await self._graph.ainvoke(state_in)
 
         # 4. Extract response
         response = self._extract_response(state)
 
-        # 5. Save to SQLite (only NEW messages, skip loaded history + new HumanMessage)
-        self.db.add_message(session_id, "user", message)
-        new_start = len(history) + 1  # skip history + HumanMessage
-        self._save_ai_messages(session_id, state, skip=new_start)
-
-        # 6. Token limit check
+        # 5. Save to SQLite (only NEW messages: HumanMessage onwards) together
+        #    with the token count, in a single transaction — then check the
+        #    token limit. Both run in the background so the reply isn't held
+        #    up by the writes; the next turn of this session waits for them.
         token_count = state.get("token_count", 0)
-        self.db.update_session_token_count(session_id, token_count)
-
-        if token_count >= self.config.assistant.session_token_limit:
-            await self._rotate_session(user_id, session_id)
+        messages = state["messages"]
+        rows = self._build_message_rows(state, skip=len(history))
+        if len(rows) == len(messages) - len(history):
+            # add_messages returned a fresh list and every message in it is
+            # persisted: cache it as-is instead of copying history again
+            self._cache_history(session_id, messages)
+        else:
+            self._history_cache.pop(session_id, None)
+        task = asyncio.create_task(
+            self._persist_turn(user_id, session_id, rows, token_count)
+        )
+        self._pending.add(task)
+        self._persisting[session_id] = task
+        task.add_done_callback(lambda t: self._forget_task(session_id, t))
 
         return response, session_id
 
+    async def _persist_turn(
+        self, user_id: str, session_id: str, rows: list[tuple], token_count: int,
+    ) -> None:
+        """Write a turn's messages + token count, then rotate if over the limit.
+
+        The write is retried before giving up, since the user has already
+        seen this turn; a final failure is logged with its traceback.
+        """
+        for attempt in range(1, _PERSIST_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(
+                    self.db.add_messages_bulk, session_id, rows, token_count=token_count,
+                )
+                break
+            except Exception as e:
+                self._history_cache.pop(session_id, None)
+                if attempt == _PERSIST_ATTEMPTS:
+                    logger.opt(exception=e).error(
+                        f"Lost turn for session {session_id} (user {user_id}): "
+                        f"{len(rows)} messages not saved after {attempt} attempts"
+                    )
+                    return
+                logger.warning(
+                    f"Persisting turn for session {session_id} failed "
+                    f"(attempt {attempt}): {e}"
+                )
+                await asyncio.sleep(_PERSIST_RETRY_DELAY * attempt)
+
+        if token_count >= self.config.assistant.session_token_limit:
+            self._history_cache.pop(session_id, None)
+            try:
+                await self._rotate_session(user_id, session_id)
+            except Exception as e:
+                logger.opt(exception=e).error(f"Failed to rotate session {session_id}")
+
+    def _forget_task(self, session_id: str, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if self._persisting.get(session_id) is task:
+            del self._persisting[session_id]
+
+    async def flush(self, session_id: str) -> None:
+        """Wait until the last turn of ``session_id`` has been written."""
+        task = self._persisting.get(session_id)
+        if task is not None:
+            await asyncio.wait({task})
+
+    async def shutdown(self) -> None:
+        """Wait for in-flight turn persistence to finish."""
+        if not self._pending:
+            return
+        logger.info(f"Waiting for {len(self._pending)} pending session writes")
+        await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _get_history(self, session_id: str) -> list:
+        """Cached history for a session, reloaded if the DB has moved on.
+
+        Other writers (background task results, monitored WhatsApp DMs) add
+        messages directly to the store, so the cached list is only reused
+        while its length matches the session's row count.
+        """
+        cached = self._history_cache.get(session_id)
+        if cached is not None and len(cached) == await asyncio.to_thread(
+            self.db.count_session_messages, session_id,
+        ):
+            self._history_cache.move_to_end(session_id)
+            return cached
+        history = await asyncio.to_thread(self._load_history, session_id)
+        self._cache_history(session_id, history)
+        return history
+
+    def _cache_history(self, session_id: str, history: list) -> None:
+        self._history_cache[session_id] = history
+        self._history_cache.move_to_end(session_id)
+        if len(self._history_cache) > _HISTORY_CACHE_MAX:
+            self._history_cache.popitem(last=False)
+
     def _load_history(self, session_id: str) -> list:
         """SQLite messages → LangChain messages."""
-        rows = self.db.get_session_messages(session_id)
-        messages = []
-        for row in rows:
-            role = row["role"]
-            content = row["content"] or ""
-            if role == "user":
-                messages.append(HumanMessage(content=content))
-            elif role == "assistant":
-                tc = None
-                if row.get("tool_calls"):
-                    try:
-                        tc = json.loads(row["tool_calls"])
-                    except json.JSONDecodeError:
-                        tc = None
-                messages.append(AIMessage(content=content, tool_calls=tc or []))
-            elif role == "tool":
-                tc_id = row.get("tool_call_id") or ""
-                messages.append(ToolMessage(content=content, tool_call_id=tc_id))
-        return messages
+        rows = self.db.get_session_messages_for_history(session_id)
+        return [
+            build(content, tool_calls, tc_id)
+            for role, content, tool_calls, tc_id in rows
+            if (build := _HISTORY_BUILDERS.get(role)) is not None
+        ]
 
     def _extract_response(self, state: dict) -> str:
         """Get final assistant text from state."""
-        for msg in reversed(state["messages"]):
+        msgs = state["messages"]
+        # Fast path: the graph normally ends on the plain assistant reply
+        if msgs:
+            last = msgs[-1]
+            if isinstance(last, AIMessage) and last.content and not last.tool_calls:
+                return last.content
+        for msg in reversed(msgs):
             if isinstance(msg, AIMessage) and msg.content and not msg.tool_calls:
                 return msg.content
         return ""
 
-    def _save_ai_messages(self, session_id: str, state: dict, skip: int = 0) -> None:
-        """Save new AI + tool messages to SQLite."""
+    @staticmethod
+    def _build_message_rows(
+        state: dict, skip: int = 0,
+    ) -> list[tuple]:
+        """New state messages → ``(role, content, tool_calls, tool_call_id)`` rows."""
+        rows: list[tuple] = []
         for msg in state["messages"][skip:]:
-            if isinstance(msg, AIMessage):
-                tc = json.dumps(msg.tool_calls) if msg.tool_calls else None
-                self.db.add_message(session_id, "assistant", msg.content, tool_calls=tc)
-            elif isinstance(msg, ToolMessage):
-                self.db.add_message(
-                    session_id, "tool", msg.content, tool_call_id=msg.tool_call_id,
-                )
+            role = _ROW_ROLES.get(type(msg)) or _row_role(msg)
+            if role is None:
+                continue
+            if role == "assistant":
+                tc = _encode_tool_calls(msg.tool_calls) if msg.tool_calls else None
+                rows.append(("assistant", msg.content, tc, None))
+            elif role == "tool":
+                rows.append(("tool", msg.content, None, msg.tool_call_id))
+            else:
+                rows.append(("user", msg.content, None, None))
+        return rows
 
     @staticmethod
     def _prepare_summary_messages(
@@ -189,11 +356,11 @@ class GraphRunner:
 
         Filters out tool messages and empty content for cleaner summaries.
         """
-        result = []
-        for msg in db_messages:
-            if msg["role"] in ("user", "assistant") and msg.get("content"):
-                result.append({"role": msg["role"], "content": msg["content"]})
-        return result
+        return [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in db_messages
+            if msg["role"] in _SUMMARY_ROLES and msg.get("content")
+        ]
 
     async def _rotate_session(self, user_id: str, session_id: str) -> None:
         """Close session with LLM summary and extract facts to DB."""
@@ -4,14 +4,34 @@ from __future__ import annotations
 
 import os
 import shutil
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 import yaml
 from loguru import logger
 
+# libyaml C loader when available (same grammar as safe_load, much faster)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
+# Skill count from which _scan_dir parses on a thread pool
+_PARALLEL_MIN = 8
+
+# Seconds a binary lookup (found or not) is reused before PATH is searched again
+_WHICH_TTL = 30.0
+
+
+@lru_cache(maxsize=256)
+def _which_cached(bin_name: str, path: str, epoch: int) -> str | None:
+    """``shutil.which`` memoized per (binary, PATH, ``_WHICH_TTL`` window)."""
+    return shutil.which(bin_name, path=path)
+
+
+@dataclass(slots=True, frozen=True)
 class SkillMeta:
     """Parsed skill metadata from YAML frontmatter."""
 
@@ -32,20 +52,52 @@ class SkillLoader:
     def __init__(self, workspace: Path, builtin_dir: Path):
         self._workspace_skills = workspace / "skills"
         self._builtin_dir = builtin_dir
+        # Parsed skills, reused until a SKILL.md is added, removed or modified.
+        # Availability is re-checked on every discover() (env vars, PATH).
+        self._cache: list[SkillMeta] | None = None
+        self._files_sig: tuple | None = None
+        self._cache_sig: tuple | None = None
+        self._by_name: dict[str, SkillMeta] = {}
+        self._requires: dict[str, tuple[list[str], list[str]]] = {}
+        # Rendered build_index() output for _cache_sig
+        self._index_cache: str | None = None
+        self._index_sig: tuple | None = None
+        # Shared builders call in from several threads (asyncio.to_thread);
+        # the cached state is read and rebuilt under this lock.
+        self._lock = threading.Lock()
 
     def discover(self) -> list[SkillMeta]:
         """Find all available skills (builtin + workspace, workspace overrides)."""
-        skills: dict[str, SkillMeta] = {}
+        with self._lock:
+            return list(self._discover())
+
+    def _discover(self) -> list[SkillMeta]:
+        """discover() body; caller holds ``_lock``."""
+        builtin = self._list_skill_files(self._builtin_dir)
+        workspace = self._list_skill_files(self._workspace_skills)
+        files = (tuple(builtin), tuple(workspace))
+        if self._cache is None or files != self._files_sig:
+            skills: dict[str, SkillMeta] = {}
+            requires: dict[str, tuple[list[str], list[str]]] = {}
 
-        # 1. Builtin skills
-        for meta in self._scan_dir(self._builtin_dir):
-            skills[meta.name] = meta
+            # 1. Builtin skills, 2. workspace skills (override builtin)
+            for meta, bins, env in self._scan_dir(builtin) + self._scan_dir(workspace):
+                skills[meta.name] = meta
+                requires[meta.name] = (bins, env)
 
-        # 2. Workspace skills (override builtin)
-        for meta in self._scan_dir(self._workspace_skills):
-            skills[meta.name] = meta
+            self._cache = sorted(skills.values(), key=lambda s: s.name)
+            self._files_sig = files
+            self._by_name = skills
+            self._requires = requires
 
-        return sorted(skills.values(), key=lambda s: s.name)
+        available = tuple(self._requirements_met(*self._requires[s.name]) for s in self._cache)
+        if available != tuple(s.available for s in self._cache):
+            self._cache = [
+                replace(s, available=a) for s, a in zip(self._cache, available, strict=True)
+            ]
+            self._by_name = {s.name: s for s in self._cache}
+        self._cache_sig = (files, available)
+        return self._cache
 
     def load_content(self, name: str) -> str | None:
         """Load a skill's markdown body (frontmatter stripped)."""
@@ -61,52 +113,90 @@ class SkillLoader:
 
     def build_index(self) -> str:
         """Build XML index of all discovered skills."""
-        skills = self.discover()
-        if not skills:
-            return ""
-        lines = ["<skills>"]
-        for s in skills:
-            avail = "true" if s.available else "false"
-            lines.append(f'  <skill available="{avail}">')
-            lines.append(f"    <name>{s.name}</name>")
-            lines.append(f"    <description>{s.description}</description>")
-            lines.append(f"    <path>{s.path}</path>")
-            lines.append("  </skill>")
-        lines.append("</skills>")
-        return "\n".join(lines)
+        with self._lock:
+            skills = self._discover()
+            if self._index_cache is not None and self._index_sig == self._cache_sig:
+                return self._index_cache
+            index = ""
+            if skills:
+                lines = ["<skills>"]
+                for s in skills:
+                    avail = "true" if s.available else "false"
+                    lines.append(f'  <skill available="{avail}">')
+                    lines.append(f"    <name>{escape(s.name)}</name>")
+                    lines.append(f"    <description>{escape(s.description)}</description>")
+                    lines.append(f"    <path>{escape(str(s.path))}</path>")
+                    lines.append("  </skill>")
+                lines.append("</skills>")
+                index = "\n".join(lines)
+            self._index_cache = index
+            self._index_sig = self._cache_sig
+            return index
 
     def _find_skill(self, name: str) -> SkillMeta | None:
         """Find a skill by name (workspace priority)."""
-        for s in self.discover():
-            if s.name == name:
-                return s
-        return None
-
-    def _scan_dir(self, base: Path) -> list[SkillMeta]:
-        """Scan a directory for SKILL.md files."""
-        results: list[SkillMeta] = []
-        if not base.is_dir():
+        with self._lock:
+            self._discover()
+            return self._by_name.get(name)
+
+    @staticmethod
+    def _list_skill_files(base: Path) -> list[tuple[str, str, int, int]]:
+        """List ``(dir_name, SKILL.md path, mtime_ns, size)`` under a directory."""
+        results: list[tuple[str, str, int, int]] = []
+        try:
+            entries = list(os.scandir(base))
+        except (FileNotFoundError, NotADirectoryError):
             return results
-        for child in sorted(base.iterdir()):
-            skill_file = child / "SKILL.md"
-            if child.is_dir() and skill_file.exists():
-                try:
-                    fm, _ = self._parse_frontmatter(skill_file)
-                    name = fm.get("name", child.name)
-                    desc = fm.get("description", "")
-                    always = fm.get("always", False)
-                    available = self._check_requirements(fm.get("metadata", {}))
-                    results.append(SkillMeta(
-                        name=name,
-                        description=desc,
-                        always=always,
-                        available=available,
-                        path=skill_file,
-                    ))
-                except Exception as e:
-                    logger.warning(f"Failed to parse skill {skill_file}: {e}")
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            skill_file = os.path.join(entry.path, "SKILL.md")
+            try:
+                st = os.stat(skill_file)
+            except OSError:
+                continue
+            results.append((entry.name, skill_file, st.st_mtime_ns, st.st_size))
+        results.sort()
         return results
 
+    def _scan_dir(
+        self, files: list[tuple[str, str, int, int]],
+    ) -> list[tuple[SkillMeta, list[str], list[str]]]:
+        """Parse the SKILL.md files found by ``_list_skill_files``.
+
+        Returns ``(meta, required bins, required env)`` per skill.
+
+        Larger catalogs are parsed on a small thread pool (file reads and
+        libyaml release the GIL); order is preserved either way.
+        """
+        if len(files) >= _PARALLEL_MIN:
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+                metas = list(pool.map(self._parse_one, files))
+        else:
+            metas = [self._parse_one(f) for f in files]
+        return [m for m in metas if m is not None]
+
+    def _parse_one(
+        self, entry: tuple[str, str, int, int],
+    ) -> tuple[SkillMeta, list[str], list[str]] | None:
+        dir_name, path, _, _ = entry
+        skill_file = Path(path)
+        try:
+            fm = self._parse_frontmatter_meta_only(skill_file)
+            name, desc, always, bins, env = self._extract_meta(fm, dir_name)
+            available = self._requirements_met(bins, env)
+            meta = SkillMeta(
+                name=name,
+                description=desc,
+                always=always,
+                available=available,
+                path=skill_file,
+            )
+            return meta, bins, env
+        except Exception as e:
+            logger.warning(f"Failed to parse skill {skill_file}: {e}")
+            return None
+
     @staticmethod
     def _parse_frontmatter(path: Path) -> tuple[dict, str]:
         """Parse YAML frontmatter + markdown body from a SKILL.md file.
@@ -121,20 +211,64 @@ class SkillLoader:
         if len(parts) < 3:
             return {}, content
 
-        fm = yaml.safe_load(parts[1]) or {}
+        fm = yaml.load(parts[1], Loader=_YamlLoader) or {}
         body = parts[2]
         return fm, body
 
+    @staticmethod
+    def _parse_frontmatter_meta_only(path: Path) -> dict:
+        """Parse only the YAML frontmatter, stopping at its closing ``---``.
+
+        Same result as ``_parse_frontmatter(path)[0]`` without reading the body.
+        """
+        buf = ""
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                buf += line
+                if not buf.startswith("---"):
+                    if len(buf) >= 3:
+                        return {}
+                    continue
+                end = buf.find("---", 3)
+                if end != -1:
+                    return yaml.load(buf[3:end], Loader=_YamlLoader) or {}
+        return {}
+
+    @staticmethod
+    def _extract_meta(
+        fm: dict, default_name: str,
+    ) -> tuple[str, str, bool, list[str], list[str]]:
+        """Frontmatter → (name, description, always, required bins, required env).
+
+        A missing or null ``metadata``/``requires`` block means no requirements.
+        """
+        requires = (fm.get("metadata") or {}).get("requires") or {}
+        return (
+            fm.get("name", default_name),
+            fm.get("description", ""),
+            fm.get("always", False),
+            requires.get("bins") or [],
+            requires.get("env") or [],
+        )
+
     @staticmethod
     def _check_requirements(metadata: dict) -> bool:
         """Check if skill requirements (bins, env) are met."""
-        requires = metadata.get("requires", {})
+        requires = metadata.get("requires") or {}
+        return SkillLoader._requirements_met(
+            requires.get("bins") or [], requires.get("env") or [],
+        )
 
-        for bin_name in requires.get("bins", []):
-            if not shutil.which(bin_name):
-                return False
+    @staticmethod
+    def _requirements_met(bins: list[str], env: list[str]) -> bool:
+        if bins:
+            path = os.environ.get("PATH", os.defpath)
+            epoch = int(time.monotonic() // _WHICH_TTL)
+            for bin_name in bins:
+                if not _which_cached(bin_name, path, epoch):
+                    return False
 
-        for env_var in requires.get("env", []):
+        for env_var in env:
             if not os.environ.get(env_var):
                 return False
 
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import operator
+from typing import Annotated
+
 from langgraph.graph import MessagesState
 
 
@@ -16,9 +19,12 @@ class AgentState(MessagesState):
     session_id: str
     channel: str
     role: str = "guest"
-    allowed_tools: set[str] | None = None
-    context_layers: set[str] | None = None
+    allowed_tools: frozenset[str] | None = None
+    context_layers: frozenset[str] | None = None
     system_prompt: str = ""
     token_count: int = 0
     iteration: int = 0
     skip_context: bool = False
+    # Tracked incrementally by the reason node (LightAgent)
+    called_tools: Annotated[set[str], operator.or_]
+    final_response: str = ""
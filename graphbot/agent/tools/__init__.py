@@ -2,23 +2,20 @@
 
 from __future__ import annotations
 
+import bisect
+import importlib
+import sys
 from dataclasses import dataclass, field
 from typing import Any
 
 from langchain_core.tools import BaseTool
 from loguru import logger
 
-from graphbot.agent.tools.filesystem import make_filesystem_tools
-from graphbot.agent.tools.memory_tools import make_memory_tools
-from graphbot.agent.tools.messaging import make_messaging_tools
-from graphbot.agent.tools.search import make_search_tools
-from graphbot.agent.tools.shell import make_shell_tools
-from graphbot.agent.tools.web import make_web_tools
 from graphbot.core.config.schema import Config
 from graphbot.memory.store import MemoryStore
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolInfo:
     """Metadata for a registered tool."""
 
@@ -34,11 +31,24 @@ class ToolRegistry:
     Each factory function (make_*_tools) registers its tools under a group name.
     roles.yaml only defines role -> groups mapping; tool names are resolved
     automatically from this registry.
+
+    Invariant: every entry in ``_tools`` is available. Unavailable tools only
+    exist as names in ``_groups`` (see ``register_unavailable``).
     """
 
     def __init__(self) -> None:
         self._tools: dict[str, ToolInfo] = {}
         self._groups: dict[str, list[str]] = {}
+        # Keys of _tools kept in sorted order (for get_catalog)
+        self._sorted_names: list[str] = []
+        # group -> available tool names, maintained at registration
+        self._available_by_group: dict[str, frozenset[str]] = {}
+        # groups tuple -> resolved tool names (cleared on registration)
+        self._resolved: dict[tuple[str, ...], frozenset[str]] = {}
+        # Bumped on every registration; derived views are keyed on it
+        self._version = 0
+        self._catalog_cache: tuple[int, list[dict[str, Any]]] | None = None
+        self._groups_cache: tuple[int, frozenset[str]] | None = None
 
     def register_group(
         self,
@@ -52,53 +62,77 @@ class ToolRegistry:
         replaces those placeholder entries.
         """
         # Clear previous entries (e.g. unavailable placeholders)
+        group = sys.intern(group)
         self._groups[group] = []
+        self._changed()
 
         for t in tools:
+            # Interned so dict/set hits on names compare by identity
+            name = sys.intern(t.name)
             info = ToolInfo(
                 tool=t, group=group, requires=requires or [], available=True,
             )
-            self._tools[t.name] = info
-            self._groups[group].append(t.name)
+            if name not in self._tools:
+                bisect.insort(self._sorted_names, name)
+            self._tools[name] = info
+            self._groups[group].append(name)
+        self._available_by_group[group] = frozenset(self._groups[group])
 
     def register_unavailable(
         self,
         group: str,
-        tool_names: list[str],
+        tool_names: list[str] | tuple[str, ...],
         requires: list[str],
     ) -> None:
         """Register tools that exist but are unavailable (missing deps).
 
         These appear in the group mapping but cannot be used at runtime.
         """
-        for name in tool_names:
-            self._groups.setdefault(group, []).append(name)
+        self._changed()
+        self._available_by_group.setdefault(group, frozenset())
+        self._groups.setdefault(group, []).extend(tool_names)
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._resolved.clear()
+
+    @property
+    def _known_groups(self) -> frozenset[str]:
+        """Registered group names (rebuilt only after a registration)."""
+        if self._groups_cache is None or self._groups_cache[0] != self._version:
+            self._groups_cache = (self._version, frozenset(self._groups))
+        return self._groups_cache[1]
 
     def get_all_tools(self) -> list:
         """Return all available tool objects."""
-        return [info.tool for info in self._tools.values() if info.available]
-
-    def get_tools_for_groups(self, groups: list[str]) -> set[str]:
-        """Resolve groups to a flat set of available tool names."""
-        names: set[str] = set()
-        for g in groups:
-            for name in self._groups.get(g, []):
-                if name in self._tools and self._tools[name].available:
-                    names.add(name)
+        return [info.tool for info in self._tools.values()]
+
+    def get_tools_for_groups(self, groups: list[str] | tuple[str, ...]) -> frozenset[str]:
+        """Resolve groups to a flat set of available tool names (memoized)."""
+        key = tuple(groups)
+        names = self._resolved.get(key)
+        if names is None:
+            empty: frozenset[str] = frozenset()
+            names = self._resolved[key] = empty.union(
+                *(self._available_by_group.get(g, empty) for g in key)
+            )
         return names
 
     def get_catalog(self) -> list[dict[str, Any]]:
-        """Full catalog for admin API introspection."""
+        """Full catalog for admin API introspection (cached until the next registration)."""
+        if self._catalog_cache is not None and self._catalog_cache[0] == self._version:
+            return self._catalog_cache[1]
         result = []
-        for name in sorted(self._tools):
+        for name in self._sorted_names:
             info = self._tools[name]
             result.append({
                 "name": name,
                 "group": info.group,
-                "description": (info.tool.description or "").split("\n")[0],
+                "description": (info.tool.description or "").partition("\n")[0],
                 "available": info.available,
                 "requires": info.requires,
             })
+        self._catalog_cache = (self._version, result)
         return result
 
     def get_groups_summary(self) -> dict[str, list[str]]:
@@ -111,9 +145,9 @@ class ToolRegistry:
         Returns list of warning messages (empty if all valid).
         """
         warnings = []
-        known_groups = set(self._groups.keys())
-        for role_name, role_cfg in roles_data.get("roles", {}).items():
-            for group in role_cfg.get("tool_groups", []):
+        known_groups = self._known_groups
+        for role_name, role_cfg in (roles_data.get("roles") or {}).items():
+            for group in (role_cfg or {}).get("tool_groups") or ():
                 if group not in known_groups:
                     warnings.append(
                         f"Role '{role_name}' references unknown group '{group}'"
@@ -129,7 +163,21 @@ class ToolRegistry:
 
 # ── Delegation tool names (for unavailable registration) ──────
 
-_DELEGATION_TOOLS = ["delegate", "list_scheduled_tasks", "cancel_scheduled_task"]
+_DELEGATION_TOOLS = ("delegate", "list_scheduled_tasks", "cancel_scheduled_task")
+
+
+# id(RagConfig) -> SemanticRetriever (the retriever keeps its config alive)
+_RETRIEVERS: dict[int, Any] = {}
+
+
+def _get_retriever(rag_config: Any) -> Any:
+    """Load the FAISS index + embedder once per RAG config."""
+    retriever = _RETRIEVERS.get(id(rag_config))
+    if retriever is None:
+        from graphbot.rag.retriever import SemanticRetriever
+
+        retriever = _RETRIEVERS[id(rag_config)] = SemanticRetriever(rag_config)
+    return retriever
 
 
 def make_tools(config: Config, db: MemoryStore) -> ToolRegistry:
@@ -140,23 +188,35 @@ def make_tools(config: Config, db: MemoryStore) -> ToolRegistry:
     """
     registry = ToolRegistry()
 
-    # Build RAG retriever if configured
+    # Build RAG retriever if configured (shared across make_tools calls)
     retriever = None
     if config.rag is not None:
         try:
-            from graphbot.rag.retriever import SemanticRetriever
-
-            retriever = SemanticRetriever(config.rag)
+            retriever = _get_retriever(config.rag)
         except ImportError:
             logger.warning("RAG deps not installed (faiss-cpu, sentence-transformers)")
 
-    # Static tools (always available)
-    registry.register_group("memory", make_memory_tools(db))
-    registry.register_group("search", make_search_tools(retriever))
-    registry.register_group("filesystem", make_filesystem_tools(config))
-    registry.register_group("shell", make_shell_tools(config))
-    registry.register_group("web", make_web_tools(config))
-    registry.register_group("messaging", make_messaging_tools(config, db))
+    # Static tools (always available). Factory modules are imported here so
+    # that importing ToolRegistry alone doesn't pull in their dependencies.
+    for group, module, factory, args in (
+        ("memory", "memory_tools", "make_memory_tools", (db,)),
+        ("search", "search", "make_search_tools", (retriever,)),
+        ("filesystem", "filesystem", "make_filesystem_tools", (config,)),
+        ("shell", "shell", "make_shell_tools", (config,)),
+        ("web", "web", "make_web_tools", (config,)),
+        ("messaging", "messaging", "make_messaging_tools", (config, db)),
+    ):
+        try:
+            mod = importlib.import_module(f"graphbot.agent.tools.{module}")
+        except ImportError as e:
+            # Only a missing third-party dependency makes a group unavailable;
+            # a broken import inside graphbot itself is a bug and must surface.
+            if e.name is None or e.name.split(".")[0] == "graphbot":
+                raise
+            logger.warning(f"Tool group '{group}' unavailable: {e}")
+            registry.register_unavailable(group, [], requires=[e.name or module])
+            continue
+        registry.register_group(group, getattr(mod, factory)(*args))
 
     # Delegation registered as unavailable until lifespan wires it up
     registry.register_unavailable(
@@ -2,18 +2,36 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
 from langchain_core.tools import tool
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
+
 if TYPE_CHECKING:
     from graphbot.core.cron.scheduler import CronScheduler
 
+_ALERT_PROMPT: Final[str] = (
+    "You are a monitoring agent. Execute the task described below.\n"
+    "Use the provided tools to check the condition.\n"
+    "If the condition is met and there is something to report, "
+    "respond with a clear notification message.\n"
+    "If the condition is NOT met and nothing needs attention, "
+    "respond ONLY with: [SKIP]"
+)
+_DEFAULT_ALERT_TOOLS: Final[tuple[str, ...]] = ("web_search", "web_fetch")
+
+_TOOLS = IdentityMemo()
+
 
 def make_cron_tools(scheduler: CronScheduler | None = None) -> list:
     """Create cron tools. Returns empty list if no scheduler provided."""
     if scheduler is None:
         return []
+    return memo_tools(_TOOLS, _build_cron_tools, scheduler)
+
+
+def _build_cron_tools(scheduler: CronScheduler) -> list:
 
     @tool
     def add_cron_job(
@@ -129,20 +147,12 @@ def make_cron_tools(scheduler: CronScheduler | None = None) -> list:
 
         Note: channel is auto-injected from session context, do not set manually.
         """
-        prompt = (
-            "You are a monitoring agent. Execute the task described below.\n"
-            "Use the provided tools to check the condition.\n"
-            "If the condition is met and there is something to report, "
-            "respond with a clear notification message.\n"
-            "If the condition is NOT met and nothing needs attention, "
-            "respond ONLY with: [SKIP]"
-        )
         # Default to web tools if no specific tools requested
-        tools = agent_tools or ["web_search", "web_fetch"]
+        tools = list(agent_tools) if agent_tools else list(_DEFAULT_ALERT_TOOLS)
         try:
             job = scheduler.add_job(
                 user_id, cron_expr, check_message, channel,
-                agent_prompt=prompt,
+                agent_prompt=_ALERT_PROMPT,
                 agent_tools=tools,
                 agent_model=agent_model,
                 notify_condition="notify_skip",
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-import json
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
+import orjson
 from langchain_core.tools import tool
 from loguru import logger
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
+
 if TYPE_CHECKING:
     from graphbot.agent.delegation import DelegationPlanner
     from graphbot.core.background.worker import SubagentWorker
@@ -15,6 +18,44 @@ if TYPE_CHECKING:
     from graphbot.memory.store import MemoryStore
 
 
+_TOOLS = IdentityMemo()
+
+
+def _encode_plan(plan: dict) -> str:
+    """Serialize a plan as compact JSON (no padding, UTF-8 kept as-is)."""
+    return orjson.dumps(plan).decode()
+
+
+# Plan used when no planner is configured; read-only and pre-encoded since
+# it never changes between calls.
+_DEFAULT_PLAN = MappingProxyType({
+    "execution": "immediate",
+    "processor": "agent",
+    "tools": ("web_search", "web_fetch", "send_message_to_user"),
+    "prompt": "Complete the given task thoroughly.",
+    "model": None,
+})
+_DEFAULT_PLAN_JSON = _encode_plan(dict(_DEFAULT_PLAN))
+
+
+def _format_plan(plan: dict) -> str:
+    """One-line summary of a planner result for logging."""
+    return (
+        f"exec={plan['execution']}, proc={plan['processor']}, "
+        f"tools={plan.get('tools')}, delay={plan.get('delay_seconds')}, "
+        f"cron={plan.get('cron_expr')}, tool_name={plan.get('tool_name')}, "
+        f"model={plan.get('model')}"
+    )
+
+
+# Fixed tail of every successful delegate() confirmation
+_OK_FOOTER = (
+    "The result will be delivered to the user's channel automatically. "
+    "STOP — do NOT call delegate again. "
+    "Tell the user EXACTLY what was set up — do NOT exaggerate or invent details."
+)
+
+
 def make_delegate_tools(
     worker: SubagentWorker | None = None,
     scheduler: CronScheduler | None = None,
@@ -28,7 +69,15 @@ def make_delegate_tools(
     """
     if worker is None and scheduler is None:
         return []
+    return memo_tools(_TOOLS, _build_delegate_tools, worker, scheduler, planner, db)
+
 
+def _build_delegate_tools(
+    worker: SubagentWorker | None,
+    scheduler: CronScheduler | None,
+    planner: DelegationPlanner | None,
+    db: MemoryStore | None,
+) -> list:
     @tool
     async def delegate(user_id: str, task: str, channel: str = "api") -> str:
         """Delegate a task for background, delayed, or scheduled execution.
@@ -57,24 +106,15 @@ def make_delegate_tools(
         """
         try:
             if planner:
-                logger.debug(f"Planner invoked for: {task[:80]}")
+                # Brace-style args: loguru only formats (and reprs the plan
+                # fields) when the level is enabled.
+                logger.debug("Planner invoked for: {:.80}", task)
                 plan = await planner.plan(task)
-                logger.info(
-                    f"Planner result: exec={plan['execution']}, "
-                    f"proc={plan['processor']}, "
-                    f"tools={plan.get('tools')}, "
-                    f"delay={plan.get('delay_seconds')}, "
-                    f"cron={plan.get('cron_expr')}, "
-                    f"tool_name={plan.get('tool_name')}, "
-                    f"model={plan.get('model')}"
+                logger.opt(lazy=True).info(
+                    "Planner result: {}", lambda: _format_plan(plan),
                 )
             else:
-                plan = {
-                    "execution": "immediate", "processor": "agent",
-                    "tools": ["web_search", "web_fetch","send_message_to_user"],
-                    "prompt": "Complete the given task thoroughly.",
-                    "model": None,
-                }
+                plan = _DEFAULT_PLAN
 
             execution = plan["execution"]
             processor = plan["processor"]
@@ -87,7 +127,9 @@ def make_delegate_tools(
                     "runner processor downgraded to agent for immediate execution"
                 )
 
-            plan_json_str = json.dumps(plan)
+            plan_json_str = (
+                _DEFAULT_PLAN_JSON if plan is _DEFAULT_PLAN else _encode_plan(plan)
+            )
 
             # Route based on execution type
             if execution == "immediate":
@@ -134,25 +176,21 @@ def make_delegate_tools(
                 )
 
             logger.info(
-                f"Delegated: {ref_id} (exec={execution}, proc={processor})"
+                "Delegated: {} (exec={}, proc={})", ref_id, execution, processor,
             )
             # Build confirmation with actual plan details so LLM reports accurately
-            detail_parts = [f"OK — task delegated ({ref_id}, {execution}/{processor})."]
             if execution == "delayed":
-                delay = plan.get("delay_seconds") or 60
-                detail_parts.append(f"Will run after {delay} seconds.")
-            elif execution in ("recurring", "monitor"):
-                detail_parts.append(f"Cron: {plan.get('cron_expr', '?')}.")
+                detail = f"Will run after {delay} seconds."
             elif execution == "immediate":
-                detail_parts.append("Running now in background (one-shot).")
-            detail_parts.append(
-                "The result will be delivered to the user's channel automatically. "
-                "STOP — do NOT call delegate again. "
-                "Tell the user EXACTLY what was set up — do NOT exaggerate or invent details."
+                detail = "Running now in background (one-shot)."
+            else:
+                detail = f"Cron: {cron_expr}."
+            return (
+                f"OK — task delegated ({ref_id}, {execution}/{processor}). "
+                f"{detail} {_OK_FOOTER}"
             )
-            return " ".join(detail_parts)
         except Exception as e:
-            logger.error(f"Delegation failed: {e}")
+            logger.error("Delegation failed: {}", e)
             return f"Failed to delegate task: {e}"
 
     @tool
@@ -164,24 +202,12 @@ def make_delegate_tools(
         lines: list[str] = []
 
         if scheduler:
-            # Cron jobs
-            jobs = scheduler.list_jobs(user_id)
-            for j in jobs:
-                status = "enabled" if j.get("enabled", 1) else "disabled"
-                proc = j.get("processor", "agent")
-                lines.append(
-                    f"- [cron:{j['job_id']}] {j['cron_expr']} → "
-                    f"{j['message'][:50]} ({status}, {proc})"
-                )
-
-            # Reminders
-            reminders = scheduler.list_reminders(user_id)
-            for r in reminders:
-                proc = r.get("processor", "static")
-                lines.append(
-                    f"- [reminder:{r['reminder_id']}] at {r['run_at']} → "
-                    f"{r['message'][:50]} ({proc})"
-                )
+            # Cron jobs, then reminders (one query, messages cut in SQL)
+            for kind, item_id, when, msg, status, proc in scheduler.list_schedule(user_id):
+                if kind == "cron":
+                    lines.append(f"- [cron:{item_id}] {when} → {msg} ({status}, {proc})")
+                else:
+                    lines.append(f"- [reminder:{item_id}] at {when} → {msg} ({proc})")
 
         if not lines:
             return "No scheduled tasks."
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from langchain_core.tools import tool
 
 from graphbot.core.config.schema import Config
 
+MAX_READ_CHARS = 50_000
+
 
 def make_filesystem_tools(config: Config) -> list:
     """Create filesystem tools sandboxed to workspace directory."""
@@ -16,8 +19,9 @@ def make_filesystem_tools(config: Config) -> list:
     def _resolve(path: str) -> Path:
         """Resolve and validate path is within workspace."""
         resolved = Path(path).expanduser().resolve()
-        # Allow workspace and its children
-        if not str(resolved).startswith(str(workspace)):
+        # Allow workspace and its children (structural check, so a sibling
+        # like "/ws-evil" does not pass as "/ws")
+        if not resolved.is_relative_to(workspace):
             raise PermissionError(
                 f"Access denied: path '{path}' is outside workspace '{workspace}'"
             )
@@ -32,9 +36,13 @@ def make_filesystem_tools(config: Config) -> list:
                 return f"File not found: {path}"
             if not p.is_file():
                 return f"Not a file: {path}"
-            content = p.read_text(encoding="utf-8")
-            if len(content) > 50_000:
-                return content[:50_000] + f"\n\n... truncated ({len(content)} chars total)"
+            # Bounded read: never pull more than the limit (+1 probe char)
+            # into memory, however large the file is.
+            with p.open("r", encoding="utf-8", errors="replace") as f:
+                content = f.read(MAX_READ_CHARS + 1)
+            if len(content) > MAX_READ_CHARS:
+                size = p.stat().st_size
+                return content[:MAX_READ_CHARS] + f"\n\n... truncated ({size} bytes on disk)"
             return content
         except PermissionError as e:
             return str(e)
@@ -58,13 +66,13 @@ def make_filesystem_tools(config: Config) -> list:
             if not p.exists():
                 return f"File not found: {path}"
             content = p.read_text(encoding="utf-8")
-            count = content.count(old_text)
-            if count == 0:
+            i = content.find(old_text)
+            if i < 0:
                 return "old_text not found in file."
-            if count > 1:
-                return f"old_text found {count} times — must be unique. Provide more context."
-            new_content = content.replace(old_text, new_text, 1)
-            p.write_text(new_content, encoding="utf-8")
+            end = i + len(old_text)
+            if content.find(old_text, max(end, i + 1)) >= 0:
+                return "old_text found multiple times — must be unique. Provide more context."
+            p.write_text(content[:i] + new_text + content[end:], encoding="utf-8")
             return "Edit applied successfully."
         except PermissionError as e:
             return str(e)
@@ -78,7 +86,10 @@ def make_filesystem_tools(config: Config) -> list:
                 return f"Directory not found: {path}"
             if not p.is_dir():
                 return f"Not a directory: {path}"
-            entries = sorted(p.iterdir(), key=lambda e: (not e.is_dir(), e.name))
+            # DirEntry caches the file type from the directory read, so the
+            # sort and the [DIR] check need no extra stat() calls.
+            with os.scandir(p) as it:
+                entries = sorted(it, key=lambda e: (not e.is_dir(), e.name))
             lines = []
             for entry in entries:
                 prefix = "[DIR]" if entry.is_dir() else f"[{_human_size(entry.stat().st_size)}]"
@@ -90,10 +101,14 @@ def make_filesystem_tools(config: Config) -> list:
     return [read_file, write_file, edit_file, list_dir]
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_SIZE_SCALE = (1, 1 << 10, 1 << 20, 1 << 30, 1 << 40)
+
+
 def _human_size(size: int) -> str:
     """Convert bytes to human-readable size."""
-    for unit in ("B", "KB", "MB", "GB"):
-        if size < 1024:
-            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
-        size /= 1024
-    return f"{size:.1f}TB"
+    if size < 1024:
+        return f"{size}B"
+    # Unit index straight from the bit length: each unit is 10 more bits
+    i = min((size.bit_length() - 1) // 10, 4)
+    return f"{size / _SIZE_SCALE[i]:.1f}{_SIZE_UNITS[i]}"
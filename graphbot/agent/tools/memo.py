@@ -0,0 +1,63 @@
+"""Identity-keyed memo for objects built from long-lived dependencies."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class IdentityMemo:
+    """Bounded FIFO memo keyed by the identity of a value's dependencies.
+
+    Used for tool lists and compiled graphs, which are expensive to build
+    (``@tool`` schema generation, graph compilation) but only depend on a
+    few long-lived objects (config, store, scheduler, ...). Each entry keeps
+    strong references to its dependencies, so the ids in its key cannot be
+    reused by other objects while it is cached.
+
+    Parameters
+    ----------
+    max_size : int
+        Entries kept; the oldest is dropped when full.
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        self.max_size = max_size
+        self._entries: dict[tuple, tuple[tuple, Any]] = {}
+
+    def get(self, deps: tuple, build: Callable[[], T], extra: Hashable = None) -> T:
+        """Return the value built for ``deps`` (and ``extra``), building it once.
+
+        Parameters
+        ----------
+        deps : tuple
+            Objects the value is built from, compared by identity.
+        build : Callable[[], T]
+            Called on a miss to build the value.
+        extra : Hashable, optional
+            Additional key part compared by value (e.g. a model name).
+        """
+        key = (tuple(map(id, deps)), extra)
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            entry = self._entries[key] = (deps, build())
+        return entry[1]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def memo_tools(memo: IdentityMemo, build: Callable[..., list], *deps: Any) -> list:
+    """Tools from ``build(*deps)``, built once per dependency set.
+
+    Returns a fresh list each call so callers can extend it safely.
+    """
+    return list(memo.get(deps, lambda: build(*deps)))
@@ -4,12 +4,18 @@ from __future__ import annotations
 
 from langchain_core.tools import tool
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
 from graphbot.memory.store import MemoryStore
 
+_TOOLS = IdentityMemo()
+
 
 def make_memory_tools(db: MemoryStore) -> list:
-    """Create memory tools closed over db."""
+    """Create memory tools closed over db (built once per store)."""
+    return memo_tools(_TOOLS, _build_memory_tools, db)
+
 
+def _build_memory_tools(db: MemoryStore) -> list:
     @tool
     def save_user_note(user_id: str, note: str) -> str:
         """Save a learned fact or note about the user for future reference."""
@@ -36,8 +42,7 @@ def make_memory_tools(db: MemoryStore) -> list:
         favs = db.get_favorites(user_id)
         if not favs:
             return "No favorites yet."
-        lines = [f"- {f['item_title']}" for f in favs]
-        return "\n".join(lines)
+        return "\n".join(f"- {f['item_title']}" for f in favs)
 
     @tool
     def remove_favorite(user_id: str, item_id: str) -> str:
@@ -60,24 +60,16 @@ def make_messaging_tools(
         - "Send a message to Zeynep saying 'Hello!'"
         - "zynp'e 'Nasılsın?' yaz"
         """
-        # Try to find user by user_id or name
-        target_user_obj = db.get_user(target_user)
+        # Try to find user by user_id or name (indexed lookup)
+        matches = db.find_user_by_name_or_id(target_user)
 
-        if not target_user_obj:
-            # Search by name
+        if len(matches) == 0:
             all_users = db.list_users()
-            matches = [
-                u for u in all_users
-                if u["name"] and u["name"].lower() == target_user.lower()
-            ]
-
-            if len(matches) == 0:
-                return f"User '{target_user}' not found. Available users: {', '.join([u['name'] or u['user_id'] for u in all_users])}"
-            elif len(matches) > 1:
-                names = [f"{u['name']} ({u['user_id']})" for u in matches]
-                return f"Multiple users found with name '{target_user}': {', '.join(names)}. Please use username instead."
-            else:
-                target_user_obj = matches[0]
+            return f"User '{target_user}' not found. Available users: {', '.join([u['name'] or u['user_id'] for u in all_users])}"
+        elif len(matches) > 1:
+            names = [f"{u['name']} ({u['user_id']})" for u in matches]
+            return f"Multiple users found with name '{target_user}': {', '.join(names)}. Please use username instead."
+        target_user_obj = matches[0]
 
         target_user_id = target_user_obj["user_id"]
         target_name = target_user_obj["name"] or target_user_id
@@ -107,7 +99,8 @@ def make_messaging_tools(
 
                 await send_message(link["channel_user_id"], int(chat_id), text)
                 logger.info(
-                    f"Message sent to {target_name} ({target_user_id}) via {channel}: {message[:50]}"
+                    "Message sent to {} ({}) via {}: {:.50}",
+                    target_name, target_user_id, channel, message,
                 )
                 return f"Message sent to {target_name} via {channel}."
 
@@ -129,7 +122,8 @@ def make_messaging_tools(
                 wa_config = config.channels.whatsapp
                 await send_whatsapp_message(wa_config, chat_id, text)
                 logger.info(
-                    f"Message sent to {target_name} ({target_user_id}) via whatsapp: {message[:50]}"
+                    "Message sent to {} ({}) via whatsapp: {:.50}",
+                    target_name, target_user_id, message,
                 )
                 return f"Message sent to {target_name} via WhatsApp."
 
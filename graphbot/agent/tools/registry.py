@@ -8,6 +8,8 @@ from langchain_core.tools import BaseTool
 from loguru import logger
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from graphbot.agent.tools import ToolRegistry
     from graphbot.core.config.schema import Config
     from graphbot.memory.store import MemoryStore
@@ -33,11 +35,11 @@ def build_background_registry(registry: ToolRegistry) -> dict[str, BaseTool]:
     dict[str, BaseTool]
         Background-safe tool name to object mapping.
     """
-    result: dict[str, BaseTool] = {}
-    for name, info in registry._tools.items():
-        if info.group not in _UNSAFE_GROUPS and info.available:
-            result[name] = info.tool
-    return result
+    return {
+        name: info.tool
+        for name, info in registry._tools.items()
+        if info.group not in _UNSAFE_GROUPS and info.available
+    }
 
 
 def build_background_tool_registry(
@@ -57,35 +59,32 @@ def build_background_tool_registry(
     """
     from graphbot.agent.tools.web import make_web_tools
 
-    registry: dict[str, BaseTool] = {}
-    for t in make_web_tools(config):
-        registry[t.name] = t
+    registry: dict[str, BaseTool] = {t.name: t for t in make_web_tools(config)}
 
     if db:
         from graphbot.agent.tools.memory_tools import make_memory_tools
         from graphbot.agent.tools.messaging import make_messaging_tools
         from graphbot.agent.tools.search import make_search_tools
 
-        for t in make_memory_tools(db):
-            registry[t.name] = t
-        for t in make_search_tools():
-            registry[t.name] = t
-        for t in make_messaging_tools(config, db, background=True):
-            registry[t.name] = t
+        registry.update({t.name: t for t in make_memory_tools(db)})
+        registry.update({t.name: t for t in make_search_tools()})
+        registry.update(
+            {t.name: t for t in make_messaging_tools(config, db, background=True)}
+        )
 
     return registry
 
 
 def resolve_tools(
     registry: dict[str, BaseTool],
-    tool_names: list[str] | None,
-    default: list[str] | None = None,
+    tool_names: Sequence[str] | None,
+    default: Sequence[str] | None = None,
 ) -> list[BaseTool]:
     """Resolve tool name strings to actual tool objects.
 
     Parameters
     ----------
-    tool_names : list[str] or None
+    tool_names : Sequence[str] or None
         None with default -> default tools.
         None without default -> empty list.
         Explicit list -> resolve from registry.
@@ -100,7 +99,7 @@ def resolve_tools(
         if name in registry:
             resolved.append(registry[name])
         else:
-            logger.warning(f"Tool '{name}' not found in registry, skipping")
+            logger.warning("Tool '{}' not found in registry, skipping", name)
     return resolved
 
 
@@ -112,10 +111,12 @@ def get_tool_catalog(registry: dict[str, BaseTool]) -> str:
     str
         Tool name + full description (up to 300 chars).
     """
-    lines = []
-    for name, t in registry.items():
-        desc = (t.description or "").strip()
-        if len(desc) > 300:
-            desc = desc[:300] + "..."
-        lines.append(f"- {name}: {desc}")
-    return "\n".join(lines)
+    return "\n".join(
+        f"- {name}: {_catalog_desc(t.description)}" for name, t in registry.items()
+    )
+
+
+def _catalog_desc(description: str | None) -> str:
+    """Stripped description, cut to 300 chars with an ellipsis."""
+    desc = (description or "").strip()
+    return desc if len(desc) <= 300 else desc[:300] + "..."
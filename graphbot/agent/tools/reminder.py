@@ -6,14 +6,28 @@ from typing import TYPE_CHECKING
 
 from langchain_core.tools import tool
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
+
 if TYPE_CHECKING:
     from graphbot.core.cron.scheduler import CronScheduler
 
 
+_TOOLS = IdentityMemo()
+
+
+def _reminder_line(r: dict) -> str:
+    kind = f"recurring ({r['cron_expr']})" if r.get("cron_expr") else r["run_at"]
+    return f"- [{r['reminder_id']}] {kind} → {r['message'][:50]}"
+
+
 def make_reminder_tools(scheduler: CronScheduler | None = None) -> list:
     """Create reminder tools. Returns empty list if no scheduler provided."""
     if scheduler is None:
         return []
+    return memo_tools(_TOOLS, _build_reminder_tools, scheduler)
+
+
+def _build_reminder_tools(scheduler: CronScheduler) -> list:
 
     @tool
     def create_reminder(
@@ -68,13 +82,7 @@ def make_reminder_tools(scheduler: CronScheduler | None = None) -> list:
         reminders = scheduler.list_reminders(user_id)
         if not reminders:
             return "No pending reminders."
-        lines = []
-        for r in reminders:
-            kind = f"recurring ({r['cron_expr']})" if r.get("cron_expr") else r["run_at"]
-            lines.append(
-                f"- [{r['reminder_id']}] {kind} → {r['message'][:50]}"
-            )
-        return "\n".join(lines)
+        return "\n".join(_reminder_line(r) for r in reminders)
 
     @tool
     def cancel_reminder(reminder_id: str) -> str:
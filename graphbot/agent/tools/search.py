@@ -2,17 +2,73 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone, timedelta
+from datetime import UTC, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from langchain_core.tools import tool
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
+
 if TYPE_CHECKING:
     from graphbot.rag.retriever import SemanticRetriever
 
 
+# Fixed offsets, only used when the system has no tz database for a name
+_DEFAULT_TZ = timezone(timedelta(hours=3))
+_TZ_TABLE: dict[str, timezone] = {
+    "Europe/Istanbul": _DEFAULT_TZ,
+    "UTC": UTC,
+    "Europe/London": UTC,
+    "Europe/Berlin": timezone(timedelta(hours=1)),
+    "US/Eastern": timezone(timedelta(hours=-5)),
+    "US/Pacific": timezone(timedelta(hours=-8)),
+}
+# Indexed by datetime.weekday() (Monday == 0)
+_DAYS_TR = ("Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar")
+
+
+@lru_cache(maxsize=32)
+def _tz(name: str) -> tzinfo:
+    """DST-aware zone for name; unknown names fall back to Europe/Istanbul.
+
+    Cached so repeated bad names do not pay for a failed tz database lookup
+    each time.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        if name in _TZ_TABLE:
+            return _TZ_TABLE[name]
+        return _tz("Europe/Istanbul") if name != "Europe/Istanbul" else _DEFAULT_TZ
+
+
+# Independent of the retriever, so it is built once and shared by every list.
+@tool
+def get_current_time(timezone_name: str = "Europe/Istanbul") -> str:
+    """Get the current date and time. Returns ISO format with day of week.
+
+    Use this tool whenever you need to know the current time, date,
+    or day of week. Default timezone is Europe/Istanbul (UTC+3). Accepts
+    any IANA timezone name (e.g. 'America/New_York', 'Asia/Tokyo').
+    """
+    now = datetime.now(_tz(timezone_name))
+    return (
+        f"{now.replace(tzinfo=None).isoformat(' ', 'seconds')} ({_DAYS_TR[now.weekday()]}), "
+        f"timezone: {timezone_name}"
+    )
+
+
+_TOOLS = IdentityMemo()
+
+
 def make_search_tools(retriever: SemanticRetriever | None = None) -> list:
     """Create search tools. Uses retriever if provided, otherwise mock."""
+    return memo_tools(_TOOLS, _build_search_tools, retriever)
+
+
+def _build_search_tools(retriever: SemanticRetriever | None) -> list:
 
     @tool
     def search_items(query: str, max_results: int = 5) -> str:
@@ -40,35 +96,4 @@ def make_search_tools(retriever: SemanticRetriever | None = None) -> list:
         lines = [f"{k}: {v}" for k, v in item.items()]
         return "\n".join(lines)
 
-    @tool
-    def get_current_time(timezone_name: str = "Europe/Istanbul") -> str:
-        """Get the current date and time. Returns ISO format with day of week.
-
-        Use this tool whenever you need to know the current time, date,
-        or day of week. Default timezone is Europe/Istanbul (UTC+3).
-        """
-        tz_offsets = {
-            "Europe/Istanbul": timedelta(hours=3),
-            "UTC": timedelta(hours=0),
-            "Europe/London": timedelta(hours=0),
-            "Europe/Berlin": timedelta(hours=1),
-            "US/Eastern": timedelta(hours=-5),
-            "US/Pacific": timedelta(hours=-8),
-        }
-        offset = tz_offsets.get(timezone_name, timedelta(hours=3))
-        tz = timezone(offset)
-        now = datetime.now(tz)
-        days_tr = {
-            "Monday": "Pazartesi", "Tuesday": "Salı",
-            "Wednesday": "Çarşamba", "Thursday": "Perşembe",
-            "Friday": "Cuma", "Saturday": "Cumartesi",
-            "Sunday": "Pazar",
-        }
-        day_en = now.strftime("%A")
-        day_tr = days_tr.get(day_en, day_en)
-        return (
-            f"{now.strftime('%Y-%m-%d %H:%M:%S')} ({day_tr}), "
-            f"timezone: {timezone_name}"
-        )
-
     return [search_items, get_item_detail, get_current_time]
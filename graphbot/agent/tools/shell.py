@@ -7,34 +7,63 @@ import re
 
 from langchain_core.tools import tool
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
 from graphbot.core.config.schema import Config
 
-# Deny patterns from nanobot — block destructive commands
+# Deny patterns from nanobot — block destructive commands (case-insensitive)
 DENY_PATTERNS: list[re.Pattern] = [
-    re.compile(r"\brm\s+(-[rR]|-[rR]?f|-f?[rR])\b"),  # rm -rf, rm -r, rm -f
-    re.compile(r"\bdel\s+/[fFqQ]\b"),  # Windows del /f /q
-    re.compile(r"\brmdir\s+/[sS]\b"),  # Windows rmdir /s
-    re.compile(r"\b(format|mkfs|diskpart)\b"),  # Disk format
-    re.compile(r"\bdd\s+if="),  # dd disk copy
-    re.compile(r">\s*/dev/sd"),  # Write to disk device
-    re.compile(r"\b(shutdown|reboot|poweroff|halt)\b"),  # Power commands
-    re.compile(r":\(\)\s*\{.*\}"),  # Fork bomb
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"\brm\s+(-r|-r?f|-f?r)\b",  # rm -rf, rm -r, rm -f
+        r"\bdel\s+/[fq]\b",  # Windows del /f /q
+        r"\brmdir\s+/s\b",  # Windows rmdir /s
+        r"\b(format|mkfs|diskpart)\b",  # Disk format
+        r"\bdd\s+if=",  # dd disk copy
+        r">\s*/dev/sd",  # Write to disk device
+        r"\b(shutdown|reboot|poweroff|halt)\b",  # Power commands
+        r":\(\)\s*\{.*\}",  # Fork bomb
+    )
 ]
 
+# All deny patterns as one alternation: a single regex scan per command
+DENY_RE: re.Pattern = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in DENY_PATTERNS), re.IGNORECASE,
+)
+
 MAX_OUTPUT = 10_000
 
 
+_TOOLS = IdentityMemo()
+
+
 def make_shell_tools(config: Config) -> list:
     """Create shell tools with safety guards."""
+    return memo_tools(_TOOLS, _build_shell_tools, config)
+
+
+async def _read_capped(stream: asyncio.StreamReader, cap: int) -> tuple[bytes, int]:
+    """Read stream to EOF, keeping only the first cap bytes.
+
+    Returns the kept bytes and the total number of bytes read.
+    """
+    buf = bytearray()
+    total = 0
+    while chunk := await stream.read(65536):
+        total += len(chunk)
+        if len(buf) < cap:
+            buf.extend(chunk[: cap - len(buf)])
+    return bytes(buf), total
+
+
+def _build_shell_tools(config: Config) -> list:
     timeout = config.tools.shell.timeout
 
     @tool
     async def exec_command(command: str, working_dir: str | None = None) -> str:
         """Execute a shell command. Dangerous commands (rm -rf, format, etc.) are blocked."""
         # Safety check
-        for pattern in DENY_PATTERNS:
-            if pattern.search(command):
-                return f"Command blocked by safety filter: {command}"
+        if DENY_RE.search(command):
+            return f"Command blocked by safety filter: {command}"
 
         try:
             proc = await asyncio.create_subprocess_shell(
@@ -43,8 +72,15 @@ def make_shell_tools(config: Config) -> list:
                 stderr=asyncio.subprocess.PIPE,
                 cwd=working_dir,
             )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(), timeout=timeout
+            # Keep at most MAX_OUTPUT bytes per stream; the rest is drained
+            # and counted so the command still runs to completion.
+            (stdout, out_total), (stderr, err_total), _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_capped(proc.stdout, MAX_OUTPUT),
+                    _read_capped(proc.stderr, MAX_OUTPUT),
+                    proc.wait(),
+                ),
+                timeout=timeout,
             )
 
             parts = []
@@ -56,8 +92,9 @@ def make_shell_tools(config: Config) -> list:
                 parts.append(f"[stderr]\n{err}")
 
             output = "\n".join(parts)
-            if len(output) > MAX_OUTPUT:
-                output = output[:MAX_OUTPUT] + f"\n\n... truncated ({len(output)} chars)"
+            total = out_total + err_total
+            if len(output) > MAX_OUTPUT or total > len(stdout) + len(stderr):
+                output = output[:MAX_OUTPUT] + f"\n\n... truncated ({total} bytes)"
 
             exit_code = proc.returncode
             return f"[exit code: {exit_code}]\n{output}" if output else f"[exit code: {exit_code}]"
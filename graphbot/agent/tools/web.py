@@ -3,25 +3,110 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import re
+import time
+from html import unescape
 
 import httpx
+import orjson
 from langchain_core.tools import tool
 from loguru import logger
 
+from graphbot.agent.tools.memo import IdentityMemo, memo_tools
 from graphbot.core.config.schema import Config
+from graphbot.core.http_client import LoopBoundClient
+
+# Optional C parser for _html_to_text (pip install graphbot[web])
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
 
 SEARCH_TIMEOUT = 10
 FETCH_TIMEOUT = 30
 MAX_REDIRECTS = 5
+# Byte budget per requested output char when streaming a fetch. Plain text and
+# JSON need at most 4 (UTF-8); HTML needs headroom for markup that is stripped.
+_TEXT_BYTES_PER_CHAR = 4
+_HTML_BYTES_PER_CHAR = 16
+_FETCH_HEADERS = {"User-Agent": "GraphBot/1.0"}
+_MOONSHOT_TOOLS = [{"type": "builtin_function", "function": {"name": "$web_search"}}]
+
+# Shared by searches and fetches so connections are pooled; timeouts are set
+# per request. HTTP/2 lets repeated provider calls multiplex over one
+# connection, kept warm between searches; retries=1 covers a connect failure
+# on a stale socket.
+_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+_HTTP = LoopBoundClient(
+    lambda: httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS, retries=1),
+        timeout=FETCH_TIMEOUT,
+        max_redirects=MAX_REDIRECTS,
+    )
+)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared web HTTP client for the running loop."""
+    return _HTTP.get()
+
+
+async def close_client() -> None:
+    """Close the shared web HTTP client (called on app shutdown)."""
+    await _HTTP.aclose()
+
+
+# Successful results are reused for a short while: an agent often repeats the
+# same search or fetch within a turn. Errors are never cached. Kept short
+# because shortcuts serve live data (weather, prices).
+SEARCH_CACHE_TTL = 300
+FETCH_CACHE_TTL = 300
+_CACHE_MAX = 256
+_ERROR_PREFIXES = (
+    "Search error:", "Search failed:", "Web search unavailable", "No results found",
+)
+
+# key -> (expires_at, result)
+_SEARCH_CACHE: dict[tuple[str, int], tuple[float, str]] = {}
+_FETCH_CACHE: dict[tuple[str, int], tuple[float, str]] = {}
+
+
+def _cache_get(cache: dict, key) -> str | None:
+    hit = cache.get(key)
+    if hit is None:
+        return None
+    if hit[0] <= time.monotonic():
+        cache.pop(key, None)
+        return None
+    return hit[1]
+
+
+def _cache_put(cache: dict, key, value: str, ttl: float) -> None:
+    if key not in cache and len(cache) >= _CACHE_MAX:
+        cache.pop(next(iter(cache)))
+    cache[key] = (time.monotonic() + ttl, value)
+
+
+def clear_web_cache() -> None:
+    """Drop all cached web_search/web_fetch results."""
+    _SEARCH_CACHE.clear()
+    _FETCH_CACHE.clear()
+
+
+_TOOLS = IdentityMemo()
+
 
 def make_web_tools(config: Config) -> list:
     """Create web tools.
 
     web_search fallback chain: DuckDuckGo → Tavily → Moonshot → Brave.
+    Built once per config and reused by the main and background registries.
     """
+    return memo_tools(_TOOLS, _build_web_tools, config)
+
+
+def _build_web_tools(config: Config) -> list:
 
     @tool
     async def web_search(query: str, count: int = 5) -> str:
@@ -35,6 +120,21 @@ def make_web_tools(config: Config) -> list:
         count : int
             Max number of results to return (default 5).
         """
+        key = (" ".join(query.lower().split()), count)
+        cached = _cache_get(_SEARCH_CACHE, key)
+        if cached is not None:
+            logger.debug(f"web_search cache hit query={query!r}")
+            return cached
+        if config.tools.web.parallel_fallback:
+            brave_key = config.tools.web.search_api_key or os.environ.get("BRAVE_API_KEY", "")
+            result = await _search_parallel(query, count, brave_key)
+        else:
+            result = await _search_providers(query, count)
+        if not result.startswith(_ERROR_PREFIXES):
+            _cache_put(_SEARCH_CACHE, key, result, SEARCH_CACHE_TTL)
+        return result
+
+    async def _search_providers(query: str, count: int) -> str:
         # Strategy 1: DuckDuckGo (free, no API key)
         ddg_result = await _ddg_search(query, count)
         if ddg_result:
@@ -87,30 +187,62 @@ def make_web_tools(config: Config) -> list:
         elif not url.startswith(("http://", "https://")):
             return f"Unknown shortcut '{url}'. Available shortcuts: {shortcut_names}"
 
-        async with httpx.AsyncClient(
-            timeout=FETCH_TIMEOUT, follow_redirects=True, max_redirects=MAX_REDIRECTS
-        ) as client:
-            try:
-                resp = await client.get(
-                    url,
-                    headers={"User-Agent": "GraphBot/1.0"},
-                )
-                resp.raise_for_status()
-            except Exception as e:
-                return f"Fetch error: {e}"
+        key = (url, max_chars)
+        text = _cache_get(_FETCH_CACHE, key)
+        if text is not None:
+            return text
 
-        content_type = resp.headers.get("content-type", "")
+        # Stream the body and stop once there is enough for max_chars, so a
+        # large page is never downloaded or decoded in full.
+        buf = bytearray()
+        timed_out = False
+        try:
+            async with _get_client().stream(
+                "GET",
+                url,
+                headers=_FETCH_HEADERS,
+                follow_redirects=True,
+                timeout=FETCH_TIMEOUT,
+            ) as resp:
+                resp.raise_for_status()
+                content_type = resp.headers.get("content-type", "")
+                is_html = "html" in content_type
+                budget = max_chars * (_HTML_BYTES_PER_CHAR if is_html else _TEXT_BYTES_PER_CHAR)
+                encoding = resp.charset_encoding or "utf-8"
+                # Bound the whole body read, not just each chunk, so a slow
+                # trickle cannot hold the tool call open indefinitely.
+                try:
+                    complete = await asyncio.wait_for(
+                        _read_bounded(resp, buf, budget), timeout=FETCH_TIMEOUT
+                    )
+                except TimeoutError:
+                    if not buf:
+                        raise
+                    complete = False
+                    timed_out = True
+        except TimeoutError:
+            return f"Fetch error: no response body within {FETCH_TIMEOUT}s"
+        except Exception as e:
+            return f"Fetch error: {e}"
 
-        if "json" in content_type:
-            text = resp.text
-        elif "html" in content_type:
-            text = _html_to_text(resp.text)
+        try:
+            text = buf.decode(encoding, errors="replace")
+        except LookupError:
+            text = buf.decode("utf-8", errors="replace")
+        if is_html:
+            text = _html_to_text(text)
+
+        if timed_out:
+            total = f"read timed out after {len(buf)} bytes"
+        elif complete:
+            total = f"{len(text)} chars total"
         else:
-            text = resp.text
-
-        if len(text) > max_chars:
-            text = text[:max_chars] + f"\n\n... truncated ({len(text)} chars total)"
+            total = f"page over {len(buf)} bytes"
+        if len(text) > max_chars or not complete:
+            text = text[:max_chars] + f"\n\n... truncated ({total})"
 
+        if not timed_out:
+            _cache_put(_FETCH_CACHE, key, text, FETCH_CACHE_TTL)
         return text
 
     # Override docstring with dynamic shortcut list
@@ -119,9 +251,101 @@ def make_web_tools(config: Config) -> list:
     return [web_search, web_fetch]
 
 
+# With parallel_fallback, how long DuckDuckGo (the preferred provider) gets
+# before any other provider's result is accepted.
+PARALLEL_HEAD_START = 0.5
+
+
+def _search_ok(result: str | None) -> bool:
+    return bool(result) and not result.startswith(_ERROR_PREFIXES)
+
+
+async def _search_parallel(query: str, count: int, brave_key: str) -> str:
+    """Run every configured provider at once and return the best early success.
+
+    Providers keep their serial preference order: a result is returned only
+    when no preferred provider is still running, except that after
+    PARALLEL_HEAD_START seconds any finished success wins. The rest are
+    cancelled.
+    """
+    coros = {"duckduckgo": _ddg_search(query, count)}
+    if tavily_key := os.environ.get("TAVILY_API_KEY", ""):
+        coros["tavily"] = _tavily_search(query, tavily_key, count)
+    if moonshot_key := os.environ.get("MOONSHOT_API_KEY", ""):
+        coros["moonshot"] = _moonshot_search(query, moonshot_key)
+    if brave_key:
+        coros["brave"] = _brave_search(query, brave_key, count)
+    tasks = {name: asyncio.create_task(coro) for name, coro in coros.items()}
+
+    loop = asyncio.get_running_loop()
+    head_start_end = loop.time() + PARALLEL_HEAD_START
+    try:
+        pending = set(tasks.values())
+        while pending:
+            remaining = head_start_end - loop.time()
+            _, pending = await asyncio.wait(
+                pending,
+                timeout=remaining if remaining > 0 else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            head_start_over = loop.time() >= head_start_end
+            for name, task in tasks.items():
+                if not task.done():
+                    if head_start_over:
+                        continue
+                    break
+                result = None if task.exception() else task.result()
+                if _search_ok(result):
+                    logger.debug(f"web_search engine={name} (parallel) query={query!r}")
+                    return result
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    # Nothing succeeded: surface the last provider error, as the serial path does
+    for task in reversed(tasks.values()):
+        if not task.cancelled() and not task.exception() and task.result():
+            return task.result()
+    return "Web search unavailable: all search providers failed."
+
+
+async def _read_bounded(resp: httpx.Response, buf: bytearray, budget: int) -> bool:
+    """Stream resp into buf until budget bytes are exceeded.
+
+    Returns True if the whole body was read. buf is filled in place so a
+    caller that times out still has the partial body.
+    """
+    # No chunk_size: rechunking would hold back bytes already received.
+    async for chunk in resp.aiter_bytes():
+        buf.extend(chunk)
+        if len(buf) > budget:
+            return False
+    return True
+
+
 # ── Search providers ─────────────────────────────────────────
 
 
+def _format_results(
+    query: str,
+    results: list[dict],
+    url_key: str,
+    snippet_key: str,
+    max_snippet: int | None = None,
+) -> str:
+    """Render provider results as a numbered list, built with a single join."""
+
+    def entry(i: int, r: dict) -> str:
+        head = f"{i}. {r.get('title', 'No title')}\n   {r.get(url_key, '')}\n"
+        snippet = r.get(snippet_key)
+        return f"{head}   {snippet[:max_snippet]}\n" if snippet else head
+
+    return f"Results for: {query}\n\n" + "\n".join(
+        entry(i, r) for i, r in enumerate(results, 1)
+    )
+
+
 async def _ddg_search(query: str, count: int = 5) -> str | None:
     """Search using DuckDuckGo (free, no API key)."""
     try:
@@ -135,15 +359,7 @@ async def _ddg_search(query: str, count: int = 5) -> str | None:
         if not results:
             return None
 
-        lines = [f"Results for: {query}\n"]
-        for i, r in enumerate(results, 1):
-            lines.append(f"{i}. {r.get('title', 'No title')}")
-            lines.append(f"   {r.get('href', '')}")
-            body = r.get("body", "")
-            if body:
-                lines.append(f"   {body}")
-            lines.append("")
-        return "\n".join(lines)
+        return _format_results(query, results, "href", "body")
 
     except Exception as e:
         logger.warning(f"DuckDuckGo search failed: {e}")
@@ -152,36 +368,28 @@ async def _ddg_search(query: str, count: int = 5) -> str | None:
 
 async def _tavily_search(query: str, api_key: str, count: int = 5) -> str | None:
     """Search using Tavily API (AI-optimized results)."""
-    async with httpx.AsyncClient(timeout=SEARCH_TIMEOUT) as client:
-        try:
-            resp = await client.post(
-                "https://api.tavily.com/search",
-                json={
-                    "api_key": api_key,
-                    "query": query,
-                    "max_results": min(count, 10),
-                    "search_depth": "basic",
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            logger.warning(f"Tavily search failed: {e}")
-            return None
+    try:
+        resp = await _get_client().post(
+            "https://api.tavily.com/search",
+            json={
+                "api_key": api_key,
+                "query": query,
+                "max_results": min(count, 10),
+                "search_depth": "basic",
+            },
+            timeout=SEARCH_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except Exception as e:
+        logger.warning(f"Tavily search failed: {e}")
+        return None
 
     results = data.get("results", [])
     if not results:
         return None
 
-    lines = [f"Results for: {query}\n"]
-    for i, r in enumerate(results, 1):
-        lines.append(f"{i}. {r.get('title', 'No title')}")
-        lines.append(f"   {r.get('url', '')}")
-        content = r.get("content", "")
-        if content:
-            lines.append(f"   {content[:200]}")
-        lines.append("")
-    return "\n".join(lines)
+    return _format_results(query, results, "url", "content", max_snippet=200)
 
 
 async def _moonshot_search(query: str, api_key: str) -> str:
@@ -189,91 +397,120 @@ async def _moonshot_search(query: str, api_key: str) -> str:
     messages = [
         {"role": "user", "content": query},
     ]
-    tools = [{"type": "builtin_function", "function": {"name": "$web_search"}}]
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            for _ in range(5):
-                resp = await client.post(
-                    "https://api.moonshot.ai/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "kimi-k2-turbo-preview",
-                        "messages": messages,
-                        "temperature": 0.6,
-                        "tools": tools,
-                        "extra_body": {"thinking": {"type": "disabled"}},
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                choice = data["choices"][0]
-
-                if choice["finish_reason"] == "tool_calls":
-                    msg = choice["message"]
-                    messages.append(msg)
-                    for tc in msg.get("tool_calls", []):
-                        args = json.loads(tc["function"]["arguments"])
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tc["id"],
-                            "name": tc["function"]["name"],
-                            "content": json.dumps(args),
-                        })
-                else:
-                    return choice["message"].get("content", "No results.")
+    client = _get_client()
+    try:
+        for _ in range(5):
+            resp = await client.post(
+                "https://api.moonshot.ai/v1/chat/completions",
+                headers=headers,
+                json={
+                    "model": "kimi-k2-turbo-preview",
+                    "messages": messages,
+                    "temperature": 0.6,
+                    "tools": _MOONSHOT_TOOLS,
+                    "extra_body": {"thinking": {"type": "disabled"}},
+                },
+                timeout=30,
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            choice = data["choices"][0]
+
+            if choice["finish_reason"] == "tool_calls":
+                msg = choice["message"]
+                messages.append(msg)
+                for tc in msg.get("tool_calls", []):
+                    args = orjson.loads(tc["function"]["arguments"])
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tc["id"],
+                        "name": tc["function"]["name"],
+                        "content": orjson.dumps(args).decode(),
+                    })
+            else:
+                return choice["message"].get("content", "No results.")
 
-        except Exception as e:
-            logger.warning(f"Moonshot search error: {e}")
-            return f"Search error: {e}"
+    except Exception as e:
+        logger.warning(f"Moonshot search error: {e}")
+        return f"Search error: {e}"
 
     return "Search failed: max iterations reached."
 
 
 async def _brave_search(query: str, api_key: str, count: int = 5) -> str:
     """Search using Brave Search API."""
-    async with httpx.AsyncClient(timeout=SEARCH_TIMEOUT) as client:
-        try:
-            resp = await client.get(
-                "https://api.search.brave.com/res/v1/web/search",
-                params={"q": query, "count": min(count, 10)},
-                headers={"X-Subscription-Token": api_key, "Accept": "application/json"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            return f"Search error: {e}"
+    try:
+        resp = await _get_client().get(
+            "https://api.search.brave.com/res/v1/web/search",
+            params={"q": query, "count": min(count, 10)},
+            headers={"X-Subscription-Token": api_key, "Accept": "application/json"},
+            timeout=SEARCH_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+    except Exception as e:
+        return f"Search error: {e}"
 
     results = data.get("web", {}).get("results", [])
     if not results:
         return f"No results found for: {query}"
 
-    lines = [f"Results for: {query}\n"]
-    for i, r in enumerate(results, 1):
-        lines.append(f"{i}. {r.get('title', 'No title')}")
-        lines.append(f"   {r.get('url', '')}")
-        desc = r.get("description", "")
-        if desc:
-            lines.append(f"   {desc}")
-        lines.append("")
-    return "\n".join(lines)
+    return _format_results(query, results, "url", "description")
 
 
 # ── HTML helper ──────────────────────────────────────────────
 
 
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_HEADING_RE = re.compile(r"<h[1-6][^>]*>(.*?)</h[1-6]>", re.IGNORECASE)
+_LINE_BREAK_RE = re.compile(r"</(?:p|div|tr|li|title)>|<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+_HEADING_SELECTOR = "h1, h2, h3, h4, h5, h6"
+_BREAK_SELECTOR = "p, div, tr, li, br, title"
+
+
+def _dom_text(html: str) -> str:
+    """Extract text with selectolax, breaking lines like the regex path.
+
+    Text comes from the whole document, so ``<head><title>`` is kept as in
+    the regex path. Entities are decoded by the parser.
+    """
+    tree = HTMLParser(html)
+    tree.strip_tags(["script", "style"])
+    for node in tree.css(_HEADING_SELECTOR):
+        node.insert_before("\n\n")
+        node.insert_after("\n")
+    for node in tree.css(_BREAK_SELECTOR):
+        node.insert_after("\n")
+    root = tree.root
+    return root.text() if root is not None else ""
+
+
 def _html_to_text(html: str) -> str:
-    """Simple HTML to text conversion (no external dependency)."""
-    text = re.sub(r"<(script|style)[^>]*>.*?</\1>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<h[1-6][^>]*>(.*?)</h[1-6]>", r"\n\n\1\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</(p|div|tr|li)>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
-    for entity, char in [("&amp;", "&"), ("&lt;", "<"), ("&gt;", ">"), ("&quot;", '"'), ("&#39;", "'"), ("&nbsp;", " ")]:
-        text = text.replace(entity, char)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
+    """HTML to text conversion: selectolax if installed, else regexes."""
+    text = html
+    if "<" in text and HTMLParser is not None:
+        text = _dom_text(text)
+    else:
+        if "<" in text:
+            # Markup passes only matter if there is any markup at all
+            text = _SCRIPT_STYLE_RE.sub("", text)
+            text = _HEADING_RE.sub(r"\n\n\1\n", text)
+            text = _LINE_BREAK_RE.sub("\n", text)
+            text = _TAG_RE.sub("", text)
+        if "&" in text:
+            # All named/numeric entities; &nbsp; still collapses like a space
+            text = unescape(text)
+    # Squeeze whitespace per line with str.split (a C loop, faster than a
+    # regex pass); lines left blank are then folded by _BLANK_LINES_RE.
+    text = "\n".join(" ".join(line.split()) for line in text.split("\n"))
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
@@ -177,10 +177,10 @@ async def admin_stats(
     """Comprehensive system stats: context, tools, sessions, tokens."""
     _require_owner(current_user, config)
 
-    from graphbot.agent.context import ContextBuilder
+    from graphbot.agent.context import get_context_builder
 
     # Context stats for owner
-    ctx = ContextBuilder(config, db)
+    ctx = get_context_builder(config, db)
     context_stats = ctx.get_context_stats(config.owner_user_id)
 
     # Tool stats
@@ -16,6 +16,7 @@ from starlette.responses import JSONResponse
 
 from graphbot import __version__
 from graphbot.agent.runner import GraphRunner
+from graphbot.agent.tools.web import close_client as close_web_client
 from graphbot.api.admin import router as admin_router
 from graphbot.api.auth import router as auth_router
 from graphbot.api.routes import router as core_router
@@ -24,7 +25,9 @@ from graphbot.core.background.heartbeat import HeartbeatService
 from graphbot.core.background.worker import SubagentWorker
 from graphbot.core.channels.discord import router as discord_router
 from graphbot.core.channels.feishu import router as feishu_router
+from graphbot.core.channels.telegram import close_client as close_telegram_client
 from graphbot.core.channels.telegram import router as telegram_router
+from graphbot.core.channels.waha_client import close_client as close_waha_client
 from graphbot.core.channels.whatsapp import router as whatsapp_router
 from graphbot.core.config.loader import load_config
 from graphbot.core.cron.scheduler import CronScheduler
@@ -169,6 +172,10 @@ async def lifespan(app: FastAPI):
     heartbeat_task.cancel()
     await cron_scheduler.stop()
     await worker.shutdown()
+    await runner.shutdown()
+    await close_telegram_client()
+    await close_waha_client()
+    await close_web_client()
     logger.info("GraphBot API shutting down")
 
 
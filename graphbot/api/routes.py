@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query
 from loguru import logger
 
 from graphbot import __version__
@@ -77,8 +77,10 @@ async def session_history(
     current_user: str = Depends(get_current_user),
     db: MemoryStore = Depends(get_db),
     config: Config = Depends(get_config),
+    runner: GraphRunner = Depends(get_runner),
 ):
     """Get all messages in a session."""
+    await runner.flush(session_id)
     session = db.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -91,12 +93,13 @@ async def session_history(
 @router.get("/session/{session_id}/stats")
 async def session_stats(
     session_id: str,
-    request: Request,
     current_user: str = Depends(get_current_user),
     db: MemoryStore = Depends(get_db),
     config: Config = Depends(get_config),
+    runner: GraphRunner = Depends(get_runner),
 ):
     """Session-level stats: messages, tokens, context breakdown, tools."""
+    await runner.flush(session_id)
     session = db.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -112,12 +115,12 @@ async def session_stats(
     tool_msgs = sum(1 for m in messages if m["role"] == "tool")
 
     # Context stats
-    from graphbot.agent.context import ContextBuilder
-    ctx = ContextBuilder(config, db)
+    from graphbot.agent.context import get_context_builder
+    ctx = get_context_builder(config, db)
     context_stats = ctx.get_context_stats(user_id)
 
     # Tool stats
-    registry = request.app.state.runner.registry
+    registry = runner.registry
     tool_total = len(registry.get_all_tools())
 
     token_count = session.get("token_count", 0)
@@ -154,8 +157,10 @@ async def end_session(
     current_user: str = Depends(get_current_user),
     db: MemoryStore = Depends(get_db),
     config: Config = Depends(get_config),
+    runner: GraphRunner = Depends(get_runner),
 ):
     """Manually close a session."""
+    await runner.flush(session_id)
     session = db.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -11,6 +11,8 @@ from loguru import logger
 from graphbot.agent.tools.registry import build_background_tool_registry, resolve_tools
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from graphbot.core.config.schema import Config
     from graphbot.memory.store import MemoryStore
 
@@ -44,7 +46,7 @@ class SubagentWorker:
         user_id: str,
         task: str,
         channel: str = "api",
-        tools: list[str] | None = None,
+        tools: Sequence[str] | None = None,
         prompt: str | None = None,
         model: str | None = None,
     ) -> str:
@@ -52,7 +54,7 @@ class SubagentWorker:
 
         Parameters
         ----------
-        tools : list[str], optional
+        tools : Sequence[str], optional
             Tool names the subagent should have access to.
             None means default tools (web_search, web_fetch).
         prompt : str, optional
@@ -79,7 +81,7 @@ class SubagentWorker:
         user_id: str,
         task: str,
         channel: str,
-        tool_names: list[str] | None = None,
+        tool_names: Sequence[str] | None = None,
         prompt: str | None = None,
         model: str | None = None,
     ) -> None:
@@ -11,12 +11,33 @@ from loguru import logger
 
 from graphbot.agent.runner import GraphRunner
 from graphbot.api.deps import get_db, get_runner
+from graphbot.core.http_client import LoopBoundClient
 from graphbot.memory.store import MemoryStore
 
 router = APIRouter(tags=["telegram"])
 
 TELEGRAM_API = "https://api.telegram.org/bot{token}"
 
+# Markdown patterns for md_to_html, compiled once
+_CODE_BLOCK_RE = re.compile(r"```(?:\w*\n)?(.*?)```", re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC_RE = re.compile(r"\*(.+?)\*")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+# Shared by all sends so the connection pool (and TLS session) is reused
+_HTTP = LoopBoundClient(lambda: httpx.AsyncClient(timeout=httpx.Timeout(30.0)))
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Telegram HTTP client for the running loop."""
+    return _HTTP.get()
+
+
+async def close_client() -> None:
+    """Close the shared Telegram HTTP client (called on app shutdown)."""
+    await _HTTP.aclose()
+
 
 @router.post("/webhooks/telegram/{user_id}")
 async def telegram_webhook(
@@ -76,32 +97,32 @@ async def send_message(token: str, chat_id: int, text: str) -> None:
     url = f"{TELEGRAM_API.format(token=token)}/sendMessage"
     html_text = md_to_html(text)
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-        resp = await client.post(
+    client = _get_client()
+    resp = await client.post(
+        url,
+        json={
+            "chat_id": chat_id,
+            "text": html_text,
+            "parse_mode": "HTML",
+        },
+    )
+    # Fallback to plain text if HTML parsing fails
+    if resp.status_code != 200:
+        logger.warning(
+            f"Telegram HTML send failed ({resp.status_code}): {resp.text[:200]}"
+        )
+        fallback_resp = await client.post(
             url,
-            json={
-                "chat_id": chat_id,
-                "text": html_text,
-                "parse_mode": "HTML",
-            },
+            json={"chat_id": chat_id, "text": text},
         )
-        # Fallback to plain text if HTML parsing fails
-        if resp.status_code != 200:
-            logger.warning(
-                f"Telegram HTML send failed ({resp.status_code}): {resp.text[:200]}"
-            )
-            fallback_resp = await client.post(
-                url,
-                json={"chat_id": chat_id, "text": text},
+        if fallback_resp.status_code != 200:
+            logger.error(
+                f"Telegram send failed ({fallback_resp.status_code}): {fallback_resp.text[:200]}"
             )
-            if fallback_resp.status_code != 200:
-                logger.error(
-                    f"Telegram send failed ({fallback_resp.status_code}): {fallback_resp.text[:200]}"
-                )
-            else:
-                logger.debug("Telegram fallback send succeeded")
         else:
-            logger.debug(f"Telegram message sent successfully to chat_id={chat_id}")
+            logger.debug("Telegram fallback send succeeded")
+    else:
+        logger.debug(f"Telegram message sent successfully to chat_id={chat_id}")
 
 
 def md_to_html(text: str) -> str:
@@ -116,22 +137,22 @@ def md_to_html(text: str) -> str:
         blocks.append(m.group(1))
         return f"%%CODEBLOCK{len(blocks) - 1}%%"
 
-    text = re.sub(r"```(?:\w*\n)?(.*?)```", save_block, text, flags=re.DOTALL)
+    text = _CODE_BLOCK_RE.sub(save_block, text)
 
     # Escape HTML entities
     text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
     # Inline code
-    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = _INLINE_CODE_RE.sub(r"<code>\1</code>", text)
 
     # Bold
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = _BOLD_RE.sub(r"<b>\1</b>", text)
 
     # Italic
-    text = re.sub(r"\*(.+?)\*", r"<i>\1</i>", text)
+    text = _ITALIC_RE.sub(r"<i>\1</i>", text)
 
     # Links
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
 
     # Restore code blocks
     for i, block in enumerate(blocks):
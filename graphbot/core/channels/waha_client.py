@@ -5,6 +5,22 @@ from __future__ import annotations
 import httpx
 from loguru import logger
 
+from graphbot.core.http_client import LoopBoundClient
+
+# Shared by all WAHAClient instances so split messages and successive replies
+# reuse pooled connections. Auth headers are sent per request.
+_HTTP = LoopBoundClient(lambda: httpx.AsyncClient(timeout=httpx.Timeout(30.0)))
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared WAHA HTTP client for the running loop."""
+    return _HTTP.get()
+
+
+async def close_client() -> None:
+    """Close the shared WAHA HTTP client (called on app shutdown)."""
+    await _HTTP.aclose()
+
 
 class WAHAClient:
     """Async client for WAHA REST API.
@@ -38,14 +54,13 @@ class WAHAClient:
             "chatId": chat_id,
             "text": text,
         }
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0), headers=self._headers()) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code not in (200, 201):
-                logger.warning(
-                    f"WAHA sendText failed ({resp.status_code}): {resp.text[:200]}"
-                )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await _get_client().post(url, json=payload, headers=self._headers())
+        if resp.status_code not in (200, 201):
+            logger.warning(
+                f"WAHA sendText failed ({resp.status_code}): {resp.text[:200]}"
+            )
+        resp.raise_for_status()
+        return resp.json()
 
     def _headers(self) -> dict[str, str]:
         """Build request headers with optional API key."""
@@ -18,6 +18,9 @@ from graphbot.memory.store import MemoryStore
 
 router = APIRouter(tags=["whatsapp"])
 
+# Any [gbot] tag the LLM added (plain, bold, repeated), plus trailing space
+_BOT_TAG_RE = re.compile(r'\*{0,2}\[gbot\]\*{0,2}\s*', re.IGNORECASE)
+
 
 @router.post("/webhooks/whatsapp/{user_id}")
 async def whatsapp_webhook(
@@ -221,7 +224,7 @@ async def send_whatsapp_message(
     # Strip ALL [gbot] variants from anywhere in text (plain, bold, repeated).
     # LLM sometimes adds **[gbot]** or [gbot] in its response — remove them all,
     # then prepend exactly one clean prefix.
-    text = re.sub(r'\*{0,2}\[gbot\]\*{0,2}\s*', '', text, flags=re.IGNORECASE).strip()
+    text = _BOT_TAG_RE.sub('', text).strip()
     text = f"{BOT_PREFIX}{text}"
 
     client = WAHAClient(wa_config.waha_url, wa_config.session, wa_config.api_key)
@@ -143,6 +143,9 @@ class WebToolConfig(BaseModel):
     search_api_key: str = ""
     max_results: int = 5
     fetch_shortcuts: dict[str, str] = Field(default_factory=dict)
+    # Query all configured search providers at once instead of one by one.
+    # Faster when DuckDuckGo is slow, but spends paid API quota on every search.
+    parallel_fallback: bool = False
 
 
 class ToolsConfig(BaseModel):
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
 import time
 import uuid
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
+import orjson
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
@@ -21,6 +21,9 @@ if TYPE_CHECKING:
     from graphbot.agent.runner import GraphRunner
     from graphbot.core.config.schema import Config
 
+# Upper bound on cached agent_tools specs per scheduler (one per distinct job)
+_MAX_TOOL_SPECS = 256
+
 
 def _should_skip(response: str) -> bool:
     """Check if LLM response should be suppressed (SKIP/NO_NOTIFY marker).
@@ -56,6 +59,8 @@ class CronScheduler:
             self._registry = build_background_tool_registry(config, db)
         else:
             self._registry = {}
+        # agent_tools spec -> resolved tools; jobs re-fire with the same spec
+        self._tools_cache: dict[str | tuple[str, ...], list] = {}
 
     async def start(self) -> None:
         """Load cron jobs and reminders from SQLite and start the scheduler."""
@@ -96,7 +101,7 @@ class CronScheduler:
         plan_json: str | None = None,
     ) -> CronJob:
         """Create a new cron job (SQLite + APScheduler)."""
-        agent_tools_json = json.dumps(agent_tools) if agent_tools else None
+        agent_tools_json = orjson.dumps(agent_tools).decode() if agent_tools else None
         job_id = str(uuid.uuid4())[:8]
         self.db.add_cron_job(
             job_id, user_id, cron_expr, message, channel,
@@ -166,7 +171,7 @@ class CronScheduler:
         plan_json : str, optional
             JSON with processor-specific config.
         """
-        agent_tools_json = json.dumps(agent_tools) if agent_tools else None
+        agent_tools_json = orjson.dumps(agent_tools).decode() if agent_tools else None
         run_at = (datetime.now() + timedelta(seconds=delay_seconds)).isoformat()
         reminder_id = str(uuid.uuid4())[:8]
         self.db.add_reminder(
@@ -195,6 +200,10 @@ class CronScheduler:
         """List pending reminders from SQLite."""
         return self.db.get_pending_reminders(user_id)
 
+    def list_schedule(self, user_id: str) -> list[tuple]:
+        """List a user's cron jobs and pending reminders as compact rows."""
+        return self.db.list_user_schedule(user_id)
+
     def cancel_reminder(self, reminder_id: str) -> bool:
         """Cancel a pending reminder. Returns True if cancelled."""
         result = self.db.cancel_reminder(reminder_id)
@@ -363,7 +372,8 @@ class CronScheduler:
 
         # New plan_json path
         prompt = plan.get("prompt") or agent_prompt
-        tools_json = json.dumps(plan.get("tools")) if plan.get("tools") else agent_tools
+        # Plan tools are already a list; no need to round-trip them through JSON
+        tool_spec = plan.get("tools") or agent_tools
         model = plan.get("model") or agent_model
 
         # Inject channel info into prompt so LightAgent uses the correct channel
@@ -374,7 +384,7 @@ class CronScheduler:
             )
 
         if prompt and self.config:
-            tools = self._parse_tools(tools_json)
+            tools = self._parse_tools(tool_spec)
             resolved_model = model or self.config.assistant.model
             agent = LightAgent(
                 config=self.config,
@@ -405,7 +415,7 @@ class CronScheduler:
         Supports NOTIFY/SKIP markers and tracks consecutive failures.
         """
         logger.info(f"Cron trigger: {job.job_id} → user={job.user_id}")
-        plan = json.loads(job.plan_json) if job.plan_json else {}
+        plan = orjson.loads(job.plan_json) if job.plan_json else {}
         processor = job.processor or plan.get("processor", "agent")
         start = time.time()
         try:
@@ -455,18 +465,26 @@ class CronScheduler:
             if count >= 3:
                 self._pause_job(job.job_id)
 
-    def _parse_tools(self, agent_tools: str | None) -> list:
-        """Parse JSON tool name list into actual tool objects.
+    def _parse_tools(self, agent_tools: str | list[str] | None) -> list:
+        """Parse a JSON tool name list (or a list of names) into tool objects.
 
         Returns empty list if agent_tools is None/empty or registry is empty.
+        Results are cached per spec, so a recurring job resolves (and warns
+        about missing tools) once rather than on every fire.
         """
         if not agent_tools or not self._registry:
             return []
-        try:
-            names = json.loads(agent_tools) if isinstance(agent_tools, str) else agent_tools
-        except json.JSONDecodeError:
-            return []
-        return resolve_tools(self._registry, names)
+        key = agent_tools if isinstance(agent_tools, str) else tuple(agent_tools)
+        cached = self._tools_cache.get(key)
+        if cached is None:
+            try:
+                names = orjson.loads(agent_tools) if isinstance(agent_tools, str) else agent_tools
+            except orjson.JSONDecodeError:
+                return []
+            if len(self._tools_cache) >= _MAX_TOOL_SPECS:
+                self._tools_cache.pop(next(iter(self._tools_cache)))
+            cached = self._tools_cache[key] = resolve_tools(self._registry, names)
+        return list(cached)
 
     def _pause_job(self, job_id: str) -> None:
         """Pause a job after consecutive failures by disabling it."""
@@ -493,7 +511,8 @@ class CronScheduler:
         user_id = row["user_id"]
         channel = row.get("channel", "telegram")
         is_recurring = bool(row.get("cron_expr"))
-        plan = json.loads(row.get("plan_json") or "{}") if row.get("plan_json") else {}
+        plan_json = row.get("plan_json")
+        plan = orjson.loads(plan_json) if plan_json else {}
         processor = row.get("processor") or plan.get("processor", "static")
 
         logger.info(
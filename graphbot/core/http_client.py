@@ -0,0 +1,69 @@
+"""Shared, event-loop-bound httpx clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Callable
+
+import httpx
+from loguru import logger
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+
+class LoopBoundClient:
+    """One pooled ``httpx.AsyncClient`` shared by all callers on a loop.
+
+    Reusing the client keeps connections (and TLS sessions) warm between
+    requests. An AsyncClient's pool belongs to the loop it was used on, so
+    when the running loop changes the old client is closed — on its own loop
+    if that is still running, otherwise on the current one — and a fresh
+    client is built.
+
+    Parameters
+    ----------
+    factory : Callable[[], httpx.AsyncClient]
+        Builds a new client.
+    """
+
+    def __init__(self, factory: Callable[[], httpx.AsyncClient]) -> None:
+        self._factory = factory
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task] = set()
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the client for the running loop."""
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is not None and not client.is_closed and self._loop is loop:
+            return client
+        if client is not None and not client.is_closed:
+            self._close_stale(client, self._loop, loop)
+        self._client = self._factory()
+        self._loop = loop
+        return self._client
+
+    def _close_stale(
+        self,
+        client: httpx.AsyncClient,
+        old_loop: asyncio.AbstractEventLoop | None,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        logger.debug("Event loop changed, closing stale HTTP client")
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), old_loop)
+            return
+        task = loop.create_task(_close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close the current client (called on app shutdown)."""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
@@ -17,6 +17,18 @@ from typing import Any
 
 from loguru import logger
 
+# Per-connection tuning.  journal_mode=WAL is persistent in the database file
+# and is set once in _init_db; GraphRunner relies on it so history reads from
+# one session don't block another session's writes.  synchronous=NORMAL is
+# crash-safe under WAL.
+_CONN_PRAGMAS = (
+    "PRAGMA foreign_keys=ON;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA busy_timeout=5000;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-20000;"
+)
+
 
 class MemoryStore:
     """SQLite memory — single source of truth."""
@@ -31,8 +43,7 @@ class MemoryStore:
     def _get_conn(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(_CONN_PRAGMAS)
         try:
             yield conn
         finally:
@@ -40,6 +51,7 @@ class MemoryStore:
 
     def _init_db(self):
         with self._get_conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(_SCHEMA)
             self._migrate(conn)
             conn.commit()
@@ -54,6 +66,21 @@ class MemoryStore:
             conn.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
         # Migrate legacy role='user' → 'member'
         conn.execute("UPDATE users SET role = 'member' WHERE role = 'user'")
+        # Lowercased name for indexed lookups. Filled in Python because
+        # SQLite's lower() only folds ASCII (names like "Çağrı" need more).
+        if "name_lower" not in cols:
+            conn.execute("ALTER TABLE users ADD COLUMN name_lower TEXT")
+        rows = conn.execute(
+            "SELECT user_id, name FROM users WHERE name IS NOT NULL AND name_lower IS NULL"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE users SET name_lower = ? WHERE user_id = ?",
+                [(name.lower(), user_id) for user_id, name in rows],
+            )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_users_name_lower ON users(name_lower)"
+        )
 
         # Cron jobs: LightAgent columns (Faz 13)
         cron_cols = {
@@ -121,8 +148,8 @@ class MemoryStore:
             if row:
                 return user_id
             conn.execute(
-                "INSERT INTO users (user_id, name) VALUES (?, ?)",
-                (user_id, name),
+                "INSERT INTO users (user_id, name, name_lower) VALUES (?, ?, ?)",
+                (user_id, name, name.lower() if name else None),
             )
             conn.commit()
             logger.info(f"New user created: {user_id}")
@@ -136,6 +163,24 @@ class MemoryStore:
             ).fetchone()
         return dict(row) if row else None
 
+    def find_user_by_name_or_id(self, query: str) -> list[dict[str, Any]]:
+        """Find users whose user_id matches or whose name matches case-insensitively.
+
+        Returns at most two rows — enough to tell a unique match from an
+        ambiguous one. An exact user_id match is returned alone.
+        """
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT user_id, name FROM users WHERE user_id = ?", (query,)
+            ).fetchone()
+            if row:
+                return [dict(row)]
+            rows = conn.execute(
+                "SELECT user_id, name FROM users WHERE name_lower = ? LIMIT 2",
+                (query.lower(),),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
     def set_user_role(self, user_id: str, role: str) -> None:
         """Update user role (owner, member, guest)."""
         with self._get_conn() as conn:
@@ -464,6 +509,36 @@ class MemoryStore:
             conn.commit()
             return cursor.lastrowid or 0
 
+    def add_messages_bulk(
+        self,
+        session_id: str,
+        rows: list[tuple[str, str, str | None, str | None]],
+        token_count: int | None = None,
+    ) -> None:
+        """Insert a turn's messages (and optionally its token count) in one transaction.
+
+        Parameters
+        ----------
+        session_id : str
+            Session the messages belong to.
+        rows : list[tuple]
+            ``(role, content, tool_calls, tool_call_id)`` tuples, in order.
+        token_count : int, optional
+            If given, ``sessions.token_count`` is updated in the same commit.
+        """
+        with self._get_conn() as conn:
+            conn.executemany(
+                """INSERT INTO messages (session_id, role, content, tool_calls, tool_call_id)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(session_id, *row) for row in rows],
+            )
+            if token_count is not None:
+                conn.execute(
+                    "UPDATE sessions SET token_count = ? WHERE session_id = ?",
+                    (token_count, session_id),
+                )
+            conn.commit()
+
     def get_session_messages(self, session_id: str) -> list[dict[str, Any]]:
         with self._get_conn() as conn:
             rows = conn.execute(
@@ -474,6 +549,27 @@ class MemoryStore:
             ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_session_messages_for_history(
+        self, session_id: str,
+    ) -> list[tuple[str, str | None, str | None, str | None]]:
+        """``(role, content, tool_calls, tool_call_id)`` rows, oldest first."""
+        with self._get_conn() as conn:
+            conn.row_factory = None
+            rows = conn.execute(
+                """SELECT role, content, tool_calls, tool_call_id
+                   FROM messages WHERE session_id = ?
+                   ORDER BY created_at ASC, id ASC""",
+                (session_id,),
+            ).fetchall()
+        return rows
+
+    def count_session_messages(self, session_id: str) -> int:
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0]
+
     def get_recent_messages(self, session_id: str, limit: int = 50) -> list[dict[str, Any]]:
         with self._get_conn() as conn:
             rows = conn.execute(
@@ -726,6 +822,32 @@ class MemoryStore:
                 ).fetchall()
         return [dict(r) for r in rows]
 
+    def list_user_schedule(self, user_id: str) -> list[tuple]:
+        """Cron jobs then pending reminders for a user, in one query.
+
+        Returns
+        -------
+        list[tuple]
+            ``(kind, id, when, message[:50], status, processor)`` rows, where
+            kind is ``"cron"`` or ``"reminder"`` and when is the cron
+            expression or run_at. status is empty for reminders.
+        """
+        with self._get_conn() as conn:
+            conn.row_factory = None
+            return conn.execute(
+                """
+                SELECT 'cron', job_id, cron_expr, substr(message, 1, 50),
+                       CASE WHEN enabled THEN 'enabled' ELSE 'disabled' END,
+                       COALESCE(processor, 'agent')
+                FROM cron_jobs WHERE user_id = ?
+                UNION ALL
+                SELECT 'reminder', reminder_id, run_at, substr(message, 1, 50),
+                       '', COALESCE(processor, 'static')
+                FROM reminders WHERE status = 'pending' AND user_id = ?
+                """,
+                (user_id, user_id),
+            ).fetchall()
+
     def mark_reminder_sent(self, reminder_id: str) -> None:
         """Mark a reminder as successfully sent."""
         with self._get_conn() as conn:
@@ -1003,6 +1125,7 @@ _SCHEMA = """
 CREATE TABLE IF NOT EXISTS users (
     user_id TEXT PRIMARY KEY,
     name TEXT,
+    name_lower TEXT,
     password_hash TEXT,
     role TEXT DEFAULT 'user',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -7,7 +7,7 @@ from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
 from graphbot.agent.context import ContextBuilder
 from graphbot.agent.graph import create_graph
-from graphbot.agent.nodes import should_continue
+from graphbot.agent.nodes import _build_tool_fields, _langchain_to_dict, should_continue
 from graphbot.agent.runner import GraphRunner
 from graphbot.core.config import Config
 from graphbot.memory.store import MemoryStore
@@ -91,6 +91,83 @@ def test_should_continue_max_iteration():
     assert should_continue(state) == "respond"
 
 
+# --- Message conversion ---
+
+def test_langchain_to_dict_roles():
+    from langchain_core.messages import AIMessageChunk, SystemMessage
+
+    assert _langchain_to_dict(HumanMessage(content="hi")) == {"role": "user", "content": "hi"}
+    assert _langchain_to_dict(SystemMessage(content="s"))["role"] == "system"
+    assert _langchain_to_dict(ToolMessage(content="r", tool_call_id="1")) == {
+        "role": "tool", "tool_call_id": "1", "content": "r",
+    }
+    ai = _langchain_to_dict(
+        AIMessage(content="", tool_calls=[{"id": "1", "name": "t", "args": {"q": "x"}}])
+    )
+    assert ai["role"] == "assistant"
+    assert ai["tool_calls"][0]["function"]["name"] == "t"
+    assert ai["tool_calls"][0]["function"]["arguments"] == '{"q":"x"}'
+    # Subclasses resolve through the MRO
+    assert _langchain_to_dict(AIMessageChunk(content="c"))["role"] == "assistant"
+
+
+# --- Single-flight LLM calls ---
+
+@pytest.mark.asyncio
+async def test_achat_single_flight_coalesces_identical_calls():
+    import asyncio
+
+    from graphbot.agent.nodes import achat_single_flight
+
+    async def slow_chat(**kwargs):
+        await asyncio.sleep(0.01)
+        return AIMessage(content="shared")
+
+    with patch("graphbot.agent.nodes.llm_provider.achat", side_effect=slow_chat) as mock:
+        msgs = [{"role": "user", "content": "hi"}]
+        a, b = await asyncio.gather(
+            achat_single_flight(messages=msgs, model="m"),
+            achat_single_flight(messages=msgs, model="m"),
+        )
+        c = await achat_single_flight(messages=msgs, model="other")
+
+    assert a is not b
+    assert a.content == b.content == c.content == "shared"
+    assert mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_achat_single_flight_propagates_errors():
+    from graphbot.agent.nodes import _inflight, achat_single_flight
+
+    with (
+        patch("graphbot.agent.nodes.llm_provider.achat", side_effect=RuntimeError("boom")),
+        pytest.raises(RuntimeError),
+    ):
+        await achat_single_flight(messages=[], model="m")
+    assert not _inflight
+
+
+# --- Tool metadata ---
+
+def test_build_tool_fields():
+    from langchain_core.tools import tool
+
+    @tool
+    def notify(user_id: str, text: str, channel: str = "api") -> str:
+        """Notify a user."""
+        return text
+
+    @tool
+    def ping() -> str:
+        """Ping."""
+        return "pong"
+
+    inject, required = _build_tool_fields([notify, ping])
+    assert inject == {"notify": frozenset({"channel"}), "ping": frozenset()}
+    assert required == {"notify": ("text", "user_id"), "ping": ()}
+
+
 # --- Runner helpers ---
 
 def test_runner_load_history(cfg, store):
@@ -107,6 +184,35 @@ def test_runner_load_history(cfg, store):
     assert isinstance(msgs[1], AIMessage)
 
 
+def test_runner_history_roundtrip_tool_calls(cfg, store):
+    sid = store.create_session("u1")
+    call = {"id": "c1", "name": "search", "args": {"q": "ö"}, "type": "tool_call"}
+    state = {
+        "messages": [
+            HumanMessage(content="find"),
+            AIMessage(content="", tool_calls=[call]),
+            ToolMessage(content="found", tool_call_id="c1"),
+        ]
+    }
+    rows = GraphRunner._build_message_rows(state)
+    assert rows[1][2] == '[{"name":"search","args":{"q":"ö"},"id":"c1"}]'
+    store.add_messages_bulk(sid, rows)
+    store.add_message(sid, "assistant", "broken", tool_calls="{not json")
+
+    runner = GraphRunner.__new__(GraphRunner)
+    runner.db = store
+    msgs = runner._load_history(sid)
+
+    assert msgs[1].tool_calls == [call]
+    assert msgs[2].tool_call_id == "c1"
+    assert msgs[3].tool_calls == []
+
+    # Subclasses (streamed chunks) map to their base role
+    from langchain_core.messages import AIMessageChunk
+    rows = GraphRunner._build_message_rows({"messages": [AIMessageChunk(content="x")]})
+    assert rows == [("assistant", "x", None, None)]
+
+
 def test_runner_extract_response():
     runner = GraphRunner.__new__(GraphRunner)
     state = {
@@ -118,6 +224,10 @@ def test_runner_extract_response():
         ]
     }
     assert runner._extract_response(state) == "Final answer"
+    # Trailing tool round without a final reply falls back to the last text answer
+    state["messages"].append(AIMessage(content="", tool_calls=[{"id": "2", "name": "t", "args": {}}]))
+    assert runner._extract_response(state) == "Final answer"
+    assert runner._extract_response({"messages": []}) == ""
 
 
 @pytest.mark.asyncio
@@ -131,6 +241,7 @@ async def test_runner_process(cfg, store):
     with patch("graphbot.agent.nodes.llm_provider.achat", new_callable=AsyncMock, return_value=ai_msg):
         runner = GraphRunner(cfg, store)
         response, session_id = await runner.process("u1", "api", "selam")
+        await runner.shutdown()
 
     assert response == "Merhaba!"
     assert session_id  # session_id returned
@@ -138,3 +249,75 @@ async def test_runner_process(cfg, store):
     msgs = store.get_session_messages(session_id)
     assert any(m["role"] == "user" for m in msgs)
     assert any(m["role"] == "assistant" for m in msgs)
+
+
+@pytest.mark.asyncio
+async def test_runner_history_cache(cfg, store):
+    """Consecutive turns reuse cached history; external writes force a reload."""
+    def reply(**kwargs):
+        return AIMessage(content="ok", response_metadata={"usage": {"total_tokens": 10}})
+
+    with patch("graphbot.agent.nodes.llm_provider.achat", new_callable=AsyncMock, side_effect=reply):
+        runner = GraphRunner(cfg, store)
+        _, sid = await runner.process("u1", "api", "one")
+        cached = runner._history_cache[sid]
+        assert len(cached) == 2
+
+        with patch.object(runner, "_load_history", wraps=runner._load_history) as load:
+            await runner.process("u1", "api", "two", session_id=sid)
+            load.assert_not_called()
+
+            await runner.shutdown()
+            store.add_message(sid, "assistant", "background result")
+            await runner.process("u1", "api", "three", session_id=sid)
+            load.assert_called_once_with(sid)
+        await runner.shutdown()
+
+    assert len(runner._history_cache[sid]) == store.count_session_messages(sid) == 7
+
+
+@pytest.mark.asyncio
+async def test_runner_persists_in_background(cfg, store):
+    """The reply is returned before the turn is written; the next turn waits for it."""
+    def reply(**kwargs):
+        return AIMessage(content="ok", response_metadata={"usage": {"total_tokens": 10}})
+
+    with patch("graphbot.agent.nodes.llm_provider.achat", new_callable=AsyncMock, side_effect=reply):
+        runner = GraphRunner(cfg, store)
+        _, sid = await runner.process("u1", "api", "one")
+        assert runner._persisting[sid] in runner._pending
+
+        runner._history_cache.clear()  # force the next turn to read SQLite
+        await runner.process("u1", "api", "two", session_id=sid)
+        await runner.shutdown()
+
+    assert not runner._pending and not runner._persisting
+    msgs = store.get_session_messages(sid)
+    assert [m["content"] for m in msgs] == ["one", "ok", "two", "ok"]
+    assert store.get_session(sid)["token_count"] == 10
+
+
+@pytest.mark.asyncio
+async def test_runner_retries_failed_turn_write(cfg, store, monkeypatch):
+    """A transient write failure is retried instead of dropping the turn."""
+    import graphbot.agent.runner as runner_mod
+
+    monkeypatch.setattr(runner_mod, "_PERSIST_RETRY_DELAY", 0)
+    real_write = store.add_messages_bulk
+    calls = []
+
+    def flaky_write(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(store, "add_messages_bulk", flaky_write)
+    reply = AIMessage(content="ok", response_metadata={"usage": {"total_tokens": 10}})
+    with patch("graphbot.agent.nodes.llm_provider.achat", new_callable=AsyncMock, return_value=reply):
+        runner = GraphRunner(cfg, store)
+        _, sid = await runner.process("u1", "api", "one")
+        await runner.shutdown()
+
+    assert len(calls) == 2
+    assert [m["content"] for m in store.get_session_messages(sid)] == ["one", "ok"]
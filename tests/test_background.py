@@ -255,6 +255,16 @@ def test_cron_tools_created(store, mock_runner):
     assert names == {"add_cron_job", "list_cron_jobs", "remove_cron_job", "create_alert"}
 
 
+def test_cron_tools_built_once_per_scheduler(store, mock_runner):
+    sched = CronScheduler(store, mock_runner)
+    first = make_cron_tools(sched)
+    second = make_cron_tools(sched)
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+    other = make_cron_tools(CronScheduler(store, mock_runner))
+    assert other[0] is not first[0]
+
+
 def test_cron_tool_add_job(store, mock_runner):
     """add_cron_job tool → scheduler.add_job → result string."""
     sched = CronScheduler(store, mock_runner)
@@ -277,6 +287,14 @@ def test_delegate_tools_none():
     assert make_delegate_tools(None, None) == []
 
 
+def test_delegate_tools_reused_for_same_dependencies(cfg, store, mock_runner):
+    worker = SubagentWorker(cfg)
+    sched = CronScheduler(store, mock_runner, config=cfg)
+    first = make_delegate_tools(worker, sched)
+    assert [t is u for t, u in zip(first, make_delegate_tools(worker, sched))] == [True] * 3
+    assert make_delegate_tools(worker, sched, db=store)[0] is not first[0]
+
+
 def test_delegate_tools_created(cfg, store, mock_runner):
     """With worker + scheduler → 3 tools."""
     worker = SubagentWorker(cfg)
@@ -197,6 +197,58 @@ async def test_telegram_non_message_update(tmp_path):
     app.state.runner.process.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_telegram_send_reuses_client():
+    """send_message reuses one HTTP client across sends until closed."""
+    import httpx
+
+    from graphbot.core.channels import telegram
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"ok": True})
+
+    await telegram.close_client()
+    client = telegram._get_client()
+    client._transport = httpx.MockTransport(handler)
+
+    await telegram.send_message("tok", 1, "hi")
+    await telegram.send_message("tok", 1, "again")
+
+    assert telegram._get_client() is client
+    assert seen == ["/bottok/sendMessage"] * 2
+
+    await telegram.close_client()
+    assert client.is_closed
+    assert telegram._get_client() is not client
+    await telegram.close_client()
+
+
+def test_loop_bound_client_closes_stale_client():
+    """A client left over from a finished loop is closed, not leaked."""
+    import asyncio
+
+    import httpx
+
+    from graphbot.core.http_client import LoopBoundClient
+
+    shared = LoopBoundClient(httpx.AsyncClient)
+
+    async def get():
+        client = shared.get()
+        await asyncio.sleep(0)  # let a stale client's close task run
+        return client
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())  # new loop → new client, old one closed
+    assert second is not first
+    assert first.is_closed and not second.is_closed
+    asyncio.run(shared.aclose())
+    assert second.is_closed
+
+
 # ── Stub Endpoints ─────────────────────────────────────────
 
 
@@ -27,6 +27,7 @@ def test_chat_single_message(tmp_path):
     """chat -m sends a single message via runner.process."""
     mock_runner = MagicMock()
     mock_runner.process = AsyncMock(return_value=("Hello from bot", "cli:default"))
+    mock_runner.shutdown = AsyncMock()
 
     fake_config = MagicMock()
     fake_config.database.path = str(tmp_path / "test.db")
@@ -44,6 +45,7 @@ def test_chat_single_message(tmp_path):
     assert result.exit_code == 0
     assert "Hello from bot" in result.output or "gbot:" in result.output.lower()
     mock_runner.process.assert_called_once_with("cli_user", "cli", "merhaba", "cli:default")
+    mock_runner.shutdown.assert_awaited_once()  # background writes drained
 
 
 def test_status_output(tmp_path):
@@ -132,6 +134,7 @@ def test_chat_uses_owner(tmp_path):
     """chat command uses owner user_id when configured."""
     mock_runner = MagicMock()
     mock_runner.process = AsyncMock(return_value=("Owner reply", "cli:default"))
+    mock_runner.shutdown = AsyncMock()
 
     fake_config = MagicMock()
     fake_config.database.path = str(tmp_path / "test.db")
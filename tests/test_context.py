@@ -1,6 +1,8 @@
 """Tests for ContextBuilder — persona, roles, token budget (Faz 12)."""
 
-from graphbot.agent.context import ContextBuilder
+import os
+
+from graphbot.agent.context import ContextBuilder, get_context_builder
 from graphbot.core.config.schema import Config
 from graphbot.memory.store import MemoryStore
 
@@ -158,3 +160,61 @@ def test_role_override_param(tmp_path):
     prompt = builder.build("testuser", role="coder")
     assert "coder" in prompt
     assert "Software engineer" in prompt
+
+
+def test_identity_reloaded_when_agent_md_changes(tmp_path):
+    """Identity is cached until AGENT.md's mtime changes."""
+    from unittest.mock import patch
+
+    builder = _make_builder(tmp_path, agent_md="# First identity")
+    agent_md = tmp_path / "workspace" / "AGENT.md"
+    with patch.object(builder, "_resolve_identity", wraps=builder._resolve_identity) as spy:
+        assert builder._get_identity() == "# First identity"
+        assert spy.call_count == 0
+
+        agent_md.write_text("# Second", encoding="utf-8")
+        os.utime(agent_md, ns=(0, agent_md.stat().st_mtime_ns + 1_000_000_000))
+        assert builder._get_identity() == "# Second"
+
+        agent_md.unlink()
+        assert "You are" in builder._get_identity()
+
+
+def test_template_with_datetime_stays_dynamic(tmp_path):
+    """Templates rendering {datetime} are re-resolved per call."""
+    template_file = tmp_path / "t.txt"
+    template_file.write_text("Now: {datetime}", encoding="utf-8")
+    builder = _make_builder(tmp_path, prompt_template=str(template_file))
+    template_file.write_text("Changed: {datetime}", encoding="utf-8")
+    assert builder._get_identity().startswith("Changed:")
+
+
+def test_dynamic_identity_concurrent_threads(tmp_path):
+    """Threads sharing a builder never see a half-updated identity."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    template_file = tmp_path / "t.txt"
+    template_file.write_text("Now: {datetime}", encoding="utf-8")
+    builder = _make_builder(tmp_path, prompt_template=str(template_file))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: builder._get_identity(), range(64)))
+    assert all(r.startswith("Now: ") for r in results)
+    assert builder._identity_state[2] is True
+
+
+def test_template_removed_stops_dynamic_identity(tmp_path):
+    """Dropping a {datetime} template falls back to a static identity."""
+    template_file = tmp_path / "t.txt"
+    template_file.write_text("Now: {datetime}", encoding="utf-8")
+    builder = _make_builder(tmp_path, prompt_template=str(template_file), agent_md="# Agent")
+    template_file.unlink()
+    assert builder._get_identity() == "# Agent"
+    assert builder._identity_state[2] is False
+
+
+def test_get_context_builder_shared(tmp_path):
+    config = Config(assistant={"system_prompt": "Shared.", "workspace": str(tmp_path)})
+    db = MemoryStore(str(tmp_path / "test.db"))
+    assert get_context_builder(config, db) is get_context_builder(config, db)
+    other = MemoryStore(str(tmp_path / "other.db"))
+    assert get_context_builder(config, other) is not get_context_builder(config, db)
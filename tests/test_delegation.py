@@ -101,6 +101,20 @@ def test_get_tool_catalog(cfg):
     assert len(lines) >= 2
 
 
+def test_get_tool_catalog_truncates_long_descriptions():
+    """Descriptions are stripped and cut at 300 chars with an ellipsis."""
+    from types import SimpleNamespace
+
+    registry = {
+        "short": SimpleNamespace(description="  Does a thing.\n"),
+        "long": SimpleNamespace(description="x" * 301),
+        "none": SimpleNamespace(description=None),
+    }
+    assert get_tool_catalog(registry) == (
+        f"- short: Does a thing.\n- long: {'x' * 300}...\n- none: "
+    )
+
+
 # ── DelegationPlanner ─────────────────────────────────────
 
 
@@ -167,6 +181,25 @@ async def test_planner_plan_calls_llm(cfg):
     assert result["prompt"] == "Research the topic."
 
 
+@pytest.mark.asyncio
+async def test_planner_prompt_rendered_once(cfg):
+    """The system prompt is prebuilt and follows tool_catalog updates."""
+    planner = DelegationPlanner(cfg, "- web_search: Search the web")
+    mock_response = AsyncMock()
+    mock_response.content = json.dumps({"processor": "static"})
+    with patch(
+        "graphbot.agent.delegation.llm_provider.achat", return_value=mock_response,
+    ) as achat:
+        await planner.plan("a")
+        planner.tool_catalog = "- weather: Get weather"
+        await planner.plan("b")
+
+    first, second = (c.kwargs["messages"][0]["content"] for c in achat.call_args_list)
+    assert "- web_search: Search the web" in first
+    assert "- weather: Get weather" in second
+    assert "web_search: Search the web" not in second
+
+
 # ── CronScheduler _parse_tools fix ────────────────────────
 
 
@@ -178,6 +211,22 @@ def test_scheduler_parse_tools_with_registry(cfg, store):
     names = [t.name for t in tools]
     assert "web_search" in names
     assert "web_fetch" in names
+    # A plan's tool list is passed through without a JSON round-trip
+    assert sched._parse_tools(["web_search", "web_fetch"]) == tools
+
+
+def test_scheduler_parse_tools_cached_per_spec(cfg, store):
+    """The same spec resolves once; callers get their own list."""
+    sched = CronScheduler(store, AsyncMock(), config=cfg)
+    spec = json.dumps(["web_search", "nonexistent_tool"])
+    with patch(
+        "graphbot.core.cron.scheduler.resolve_tools", wraps=resolve_tools,
+    ) as spy:
+        first = sched._parse_tools(spec)
+        second = sched._parse_tools(spec)
+    assert spy.call_count == 1
+    assert [t.name for t in second] == ["web_search"]
+    assert second == first and second is not first
 
 
 def test_scheduler_parse_tools_none():
@@ -233,6 +282,29 @@ async def test_delegate_with_planner(cfg):
     planner.plan.assert_called_once_with("Bitcoin fiyatı")
 
 
+@pytest.mark.asyncio
+async def test_delegate_without_planner_uses_default_plan(cfg, store):
+    """No planner → constant immediate/agent plan, logged as compact JSON."""
+    from graphbot.core.background.worker import SubagentWorker
+
+    worker = SubagentWorker(cfg)
+    delegate_tool = make_delegate_tools(worker, db=store)[0]
+    with (
+        patch.object(worker, "spawn", return_value="abc123") as mock_spawn,
+        patch.object(store, "log_delegation") as mock_log,
+    ):
+        result = await delegate_tool.ainvoke({"user_id": "u1", "task": "Research"})
+        await delegate_tool.ainvoke({"user_id": "u1", "task": "Again"})
+
+    assert "abc123" in result
+    assert mock_spawn.call_args.kwargs["tools"] == (
+        "web_search", "web_fetch", "send_message_to_user",
+    )
+    plan_json = mock_log.call_args.kwargs["plan_json"]
+    assert json.loads(plan_json)["processor"] == "agent"
+    assert ", " not in plan_json
+
+
 # ── Planner parse — new execution/processor combinations ──
 
 
@@ -403,12 +475,17 @@ async def test_delegate_delayed_static(cfg, store):
         })
         assert "rem123" in result
         assert "delayed" in result
+        assert "Will run after 120 seconds." in result
         mock_add.assert_called_once()
         call_kwargs = mock_add.call_args
         assert call_kwargs[0][0] == "u1"  # user_id
         assert call_kwargs[0][1] == "telegram"  # channel
         assert call_kwargs[0][2] == 120  # delay_seconds
         assert call_kwargs.kwargs["processor"] == "static"
+        # plan_json is stored as compact JSON
+        plan_json = call_kwargs.kwargs["plan_json"]
+        assert json.loads(plan_json)["delay_seconds"] == 120
+        assert ", " not in plan_json and ": " not in plan_json
 
 
 @pytest.mark.asyncio
@@ -476,6 +553,7 @@ async def test_delegate_recurring_agent(cfg, store):
         })
         assert "cron789" in result
         assert "recurring" in result
+        assert "Cron: 0 9 * * *." in result
         mock_add.assert_called_once()
         assert mock_add.call_args.kwargs["processor"] == "agent"
         assert mock_add.call_args.kwargs["notify_condition"] == "always"
@@ -608,16 +686,18 @@ async def test_list_scheduled_tasks(cfg, store):
     tools = make_delegate_tools(scheduler=sched, db=store)
     list_tool = next(t for t in tools if t.name == "list_scheduled_tasks")
 
-    with patch.object(sched, "list_jobs", return_value=[
-        {"job_id": "j1", "cron_expr": "0 9 * * *", "message": "Weather check", "enabled": 1, "processor": "agent"},
-    ]), patch.object(sched, "list_reminders", return_value=[
-        {"reminder_id": "r1", "run_at": "2025-01-01T10:00:00", "message": "Meeting", "processor": "static"},
-    ]):
-        result = list_tool.invoke({"user_id": "u1"})
-        assert "j1" in result
-        assert "r1" in result
-        assert "Weather check" in result
-        assert "Meeting" in result
+    store.get_or_create_user("u1")
+    store.get_or_create_user("u2")
+    store.add_cron_job("j1", "u1", "0 9 * * *", "Weather check", "api")
+    store.add_reminder("r1", "u1", "2025-01-01T10:00:00", "Meeting " + "x" * 60)
+    store.add_cron_job("j2", "u2", "0 9 * * *", "Someone else", "api")
+
+    result = list_tool.invoke({"user_id": "u1"})
+    assert result.splitlines() == [
+        "- [cron:j1] 0 9 * * * → Weather check (enabled, agent)",
+        "- [reminder:r1] at 2025-01-01T10:00:00 → Meeting " + "x" * 42 + " (static)",
+    ]
+    assert list_tool.invoke({"user_id": "nobody"}) == "No scheduled tasks."
 
 
 @pytest.mark.asyncio
@@ -97,7 +97,8 @@ async def test_e2e_chat_with_tool_call(client, app):
     notes = db.get_notes("u1")
     assert any("coffee" in n for n in notes)
 
-    # Verify messages persisted
+    # Verify messages persisted (written in the background after the reply)
+    await app.state.runner.flush(data["session_id"])
     msgs = db.get_session_messages(data["session_id"])
     roles = [m["role"] for m in msgs]
     assert "user" in roles
@@ -187,6 +187,44 @@ async def test_light_agent_isolated(cfg):
             assert response == "Done"
 
 
+@pytest.mark.asyncio
+async def test_light_agent_run_with_meta_tracks_tools(cfg):
+    """Called tool names and final text are collected during the run."""
+    from graphbot.agent.light import LightAgent
+    from langchain_core.messages import AIMessage
+    from langchain_core.tools import tool
+
+    @tool
+    def ping() -> str:
+        """Ping."""
+        return "pong"
+
+    responses = [
+        AIMessage(content="", tool_calls=[{"id": "1", "name": "ping", "args": {}}]),
+        AIMessage(content="All good"),
+    ]
+
+    with patch("graphbot.core.providers.litellm.achat", side_effect=responses):
+        with patch("graphbot.core.providers.litellm.setup_provider"):
+            agent = LightAgent(config=cfg, prompt="Test", tools=[ping])
+            response, _, called = await agent.run_with_meta("ping it")
+
+    assert response == "All good"
+    assert called == {"ping"}
+
+
+def test_light_agent_reuses_compiled_graph(cfg):
+    """Agents with the same tools/model/config share one compiled graph."""
+    from graphbot.agent.light import LightAgent
+
+    with patch("graphbot.core.providers.litellm.setup_provider"):
+        a = LightAgent(config=cfg, prompt="A")
+        b = LightAgent(config=cfg, prompt="B")
+        c = LightAgent(config=cfg, prompt="A", model="other/model")
+    assert a._graph is b._graph
+    assert a._graph is not c._graph
+
+
 @pytest.mark.asyncio
 async def test_cron_job_with_agent_config(store, mock_runner, cfg):
     """agent_prompt set → LightAgent is used (not runner)."""
@@ -96,6 +96,19 @@ def test_unknown_role_empty(roles_file, mock_registry):
     assert allowed == set()
 
 
+def test_allowed_tools_resolved_once_per_registry(roles_file, mock_registry):
+    first = get_allowed_tools("member", registry=mock_registry, path=roles_file)
+    assert get_allowed_tools("member", registry=mock_registry, path=roles_file) is first
+
+    # Registering tools invalidates the registry's resolved sets
+    web_tool = MagicMock()
+    web_tool.name = "web_lookup"
+    mock_registry.register_group("web", [web_tool])
+    assert get_allowed_tools("member", registry=mock_registry, path=roles_file) == {
+        "web_lookup", "save_user_note", "get_user_context",
+    }
+
+
 def test_context_layers_owner(roles_file):
     layers = get_context_layers("owner", path=roles_file)
     assert "agent_memory" in layers
@@ -150,3 +163,38 @@ def test_registry_groups_summary(mock_registry):
     assert "web_search" in summary["web"]
     assert "memory" in summary
     assert len(summary) == 3
+
+
+def test_legacy_tool_groups_resolved(tmp_path):
+    """Without a registry, tool names come from roles.yaml tool_groups."""
+    data = {
+        "roles": {"member": {"tool_groups": ["web", "memory"]}},
+        "tool_groups": {"web": ["web_search"], "memory": ["save_user_note"]},
+    }
+    path = tmp_path / "roles.yaml"
+    path.write_text(yaml.dump(data))
+    assert get_allowed_tools("member", path=path) == {"web_search", "save_user_note"}
+    assert get_context_layers("member", path=path) == set()
+    assert get_max_sessions("member", path=path) == 0
+    assert get_max_sessions("unknown", path=path) == 1
+
+
+def test_roles_yaml_reloaded_on_change(roles_file, monkeypatch):
+    """Edits to roles.yaml are picked up once the check interval passes."""
+    import os
+
+    from graphbot.agent import permissions
+
+    assert get_max_sessions("guest", path=roles_file) == 1
+
+    data = yaml.safe_load(roles_file.read_text())
+    data["roles"]["guest"]["max_sessions"] = 3
+    roles_file.write_text(yaml.dump(data))
+    st = roles_file.stat()
+    os.utime(roles_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    # Within the interval the cached value is served
+    assert get_max_sessions("guest", path=roles_file) == 1
+
+    monkeypatch.setattr(permissions, "_RELOAD_INTERVAL", 0.0)
+    assert get_max_sessions("guest", path=roles_file) == 3
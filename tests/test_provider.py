@@ -45,6 +45,15 @@ def _make_openrouter_response(content="hello", tool_calls=None, reasoning=None):
 # ── Factory routing ───────────────────────────────────────
 
 
+def test_litellm_leaves_client_session_to_litellm(cfg, monkeypatch):
+    """No process-global session: litellm keeps its per-loop client cache."""
+    import litellm
+
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    LiteLLMLLM(cfg)
+    assert litellm.aclient_session is None
+
+
 def test_setup_provider_openrouter(cfg):
     """openrouter/ model creates OpenRouterLLM as main provider."""
     from graphbot.core.providers import litellm as facade
@@ -412,6 +412,7 @@ async def test_process_triggers_full_rotation(store):
     ) as mock_ext:
         runner = GraphRunner(cfg, store)
         response, sid = await runner.process("u1", "api", "hi")
+        await runner.shutdown()  # persistence + rotation run in the background
 
     mock_sum.assert_called_once()
     mock_ext.assert_called_once()
@@ -419,3 +420,28 @@ async def test_process_triggers_full_rotation(store):
     session = store.get_session(sid)
     assert session["ended_at"] is not None
     assert session["summary"] == "Summary of conversation."
+
+
+@pytest.mark.asyncio
+async def test_turn_after_pending_rotation_opens_new_session(store):
+    """A turn that races a background rotation goes to a fresh session."""
+    cfg = Config(assistant={"system_prompt": "Bot.", "session_token_limit": 50})
+    ai_msg = AIMessage(content="Hello!", response_metadata={"usage": {"total_tokens": 100}})
+
+    with patch(
+        "graphbot.agent.nodes.llm_provider.achat", new_callable=AsyncMock, return_value=ai_msg,
+    ), patch(
+        "graphbot.agent.runner.asummarize", new_callable=AsyncMock, return_value="Summary.",
+    ), patch(
+        "graphbot.agent.runner.aextract_facts", new_callable=AsyncMock, return_value={},
+    ):
+        runner = GraphRunner(cfg, store)
+        _, s1 = await runner.process("u1", "api", "one")
+        assert s1 in runner._persisting  # rotation still pending
+        _, s2 = await runner.process("u1", "api", "two", session_id=s1)
+        await runner.shutdown()
+
+    assert s2 != s1
+    assert store.get_session(s1)["ended_at"] is not None
+    assert [m["content"] for m in store.get_session_messages(s1)] == ["one", "Hello!"]
+    assert [m["content"] for m in store.get_session_messages(s2)] == ["two", "Hello!"]
@@ -63,6 +63,19 @@ def test_parse_frontmatter_no_yaml(tmp_path):
     assert "Just markdown" in body
 
 
+def test_parse_frontmatter_meta_only(tmp_path):
+    """Meta-only parse matches the full parse without needing the body."""
+    path = tmp_path / "SKILL.md"
+    path.write_text(
+        "---\nname: test\nmetadata:\n  requires:\n    bins: [curl]\n---\n\n# Body\n" + "x\n" * 1000
+    )
+    assert SkillLoader._parse_frontmatter_meta_only(path) == SkillLoader._parse_frontmatter(path)[0]
+
+    for text in ("# No frontmatter\n", "---\nname: unterminated\n", "-", ""):
+        path.write_text(text)
+        assert SkillLoader._parse_frontmatter_meta_only(path) == SkillLoader._parse_frontmatter(path)[0]
+
+
 # ── Discovery ──────────────────────────────────────────────
 
 
@@ -88,6 +101,85 @@ def test_discover_workspace_override(workspace, builtin_dir):
     assert str(workspace) in str(weather.path)
 
 
+def test_discover_cached_until_skill_changes(workspace, builtin_dir, monkeypatch):
+    """Unchanged skill files are not re-parsed; edits and new skills are picked up."""
+    path = _make_skill(
+        workspace / "skills", "greeter",
+        "name: greeter\ndescription: v1\n", "# Greeter",
+    )
+    loader = SkillLoader(workspace=workspace, builtin_dir=builtin_dir)
+    assert next(s for s in loader.discover() if s.name == "greeter").description == "v1"
+
+    calls = []
+    original = SkillLoader._parse_frontmatter
+    monkeypatch.setattr(
+        SkillLoader, "_parse_frontmatter",
+        staticmethod(lambda p: calls.append(p) or original(p)),
+    )
+    loader.discover()
+    loader.build_index()
+    assert calls == []
+
+    path.write_text("---\nname: greeter\ndescription: version two\n---\n\n# Greeter")
+    assert next(s for s in loader.discover() if s.name == "greeter").description == "version two"
+
+    _make_skill(workspace / "skills", "extra", "name: extra\ndescription: x\n", "# Extra")
+    assert "extra" in {s.name for s in loader.discover()}
+
+
+def test_discover_rechecks_requirements(workspace, builtin_dir, monkeypatch):
+    """Availability follows env changes without any SKILL.md edit."""
+    monkeypatch.delenv("TEST_SKILL_TOKEN", raising=False)
+    _make_skill(
+        workspace / "skills", "api",
+        "name: api\ndescription: x\nmetadata:\n  requires:\n    env: [TEST_SKILL_TOKEN]\n",
+        "# Api",
+    )
+    loader = SkillLoader(workspace=workspace, builtin_dir=builtin_dir)
+    assert loader._find_skill("api").available is False
+    assert '<skill available="false">\n    <name>api</name>' in loader.build_index()
+
+    monkeypatch.setenv("TEST_SKILL_TOKEN", "t")
+    assert loader._find_skill("api").available is True
+    assert '<skill available="true">\n    <name>api</name>' in loader.build_index()
+
+
+def test_discover_concurrent_threads(workspace, builtin_dir, monkeypatch):
+    """Threads sharing a loader see consistent skills while files change."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    loader = SkillLoader(workspace=workspace, builtin_dir=builtin_dir)
+    checked = []
+    original = SkillLoader._requirements_met
+
+    def requirements_met(bins, env):
+        checked.append(loader._lock.locked())
+        return original(bins, env)
+
+    monkeypatch.setattr(SkillLoader, "_requirements_met", staticmethod(requirements_met))
+
+    def work(i: int) -> None:
+        _make_skill(workspace / "skills", f"s{i}", f"name: s{i}\ndescription: x\n", "# S")
+        assert loader._find_skill(f"s{i}") is not None
+        assert f"s{i}" in {s.name for s in loader.discover()}
+        assert f"<name>s{i}</name>" in loader.build_index()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(32)))
+    assert checked and all(checked)
+
+
+def test_discover_many_skills_parallel(workspace, builtin_dir):
+    """Large catalogs (thread-pool path) keep every skill and skip broken ones."""
+    for i in range(12):
+        _make_skill(workspace / "skills", f"s{i:02d}", f"name: s{i:02d}\ndescription: d{i}\n", "# S")
+    _make_skill(workspace / "skills", "broken", "name: [unclosed\n", "# Broken")
+    loader = SkillLoader(workspace=workspace, builtin_dir=builtin_dir)
+    names = [s.name for s in loader.discover()]
+    assert [n for n in names if n.startswith("s") and n[1:].isdigit()] == [f"s{i:02d}" for i in range(12)]
+    assert "broken" not in names
+
+
 # ── Load Content ───────────────────────────────────────────
 
 
@@ -135,6 +227,33 @@ def test_requirements_check_bins():
     assert SkillLoader._check_requirements({"requires": {"bins": ["xyznotreal123"]}}) is False
 
 
+def test_requirements_which_cached_per_path(monkeypatch):
+    """Binary lookups are memoized, but a PATH change or expiry is seen."""
+    from graphbot.agent.skills import loader as loader_mod
+
+    loader_mod._which_cached.cache_clear()
+    calls = []
+    monkeypatch.setattr(
+        loader_mod.shutil, "which",
+        lambda name, path=None: calls.append((name, path)) or "/bin/" + name,
+    )
+    monkeypatch.setenv("PATH", "/a")
+    meta = {"requires": {"bins": ["tool"]}}
+    assert SkillLoader._check_requirements(meta) is True
+    assert SkillLoader._check_requirements(meta) is True
+    assert calls == [("tool", "/a")]
+
+    monkeypatch.setenv("PATH", "/b")
+    SkillLoader._check_requirements(meta)
+    assert calls[-1] == ("tool", "/b")
+
+    now = loader_mod.time.monotonic() + loader_mod._WHICH_TTL
+    monkeypatch.setattr(loader_mod.time, "monotonic", lambda: now)
+    SkillLoader._check_requirements(meta)
+    assert len(calls) == 3
+    loader_mod._which_cached.cache_clear()
+
+
 def test_requirements_check_env(monkeypatch):
     """Missing env var → False, set env var → True."""
     monkeypatch.setenv("TEST_SKILL_KEY", "abc")
@@ -143,6 +262,14 @@ def test_requirements_check_env(monkeypatch):
     assert SkillLoader._check_requirements({"requires": {"env": ["TEST_SKILL_KEY"]}}) is False
 
 
+def test_extract_meta_defaults():
+    """Missing or null metadata blocks mean no requirements."""
+    assert SkillLoader._extract_meta({}, "dir") == ("dir", "", False, [], [])
+    assert SkillLoader._extract_meta({"metadata": None}, "dir")[3:] == ([], [])
+    fm = {"name": "w", "always": True, "metadata": {"requires": {"bins": ["curl"], "env": None}}}
+    assert SkillLoader._extract_meta(fm, "dir") == ("w", "", True, ["curl"], [])
+
+
 # ── Build Index ────────────────────────────────────────────
 
 
@@ -156,6 +283,21 @@ def test_build_index(loader):
     assert 'available="' in index
 
 
+def test_build_index_escapes_and_caches(workspace, builtin_dir):
+    """Descriptions are XML-escaped; the index is rebuilt only when skills change."""
+    _make_skill(
+        workspace / "skills", "cmp",
+        "name: cmp\ndescription: \"a < b & c\"\n", "# Compare",
+    )
+    loader = SkillLoader(workspace=workspace, builtin_dir=builtin_dir)
+    index = loader.build_index()
+    assert "<description>a &lt; b &amp; c</description>" in index
+    assert loader.build_index() is index
+
+    _make_skill(workspace / "skills", "extra", "name: extra\ndescription: x\n", "# Extra")
+    assert "<name>extra</name>" in loader.build_index()
+
+
 # ── Context Integration ────────────────────────────────────
 
 
@@ -38,6 +38,14 @@ def test_sessions(store):
     assert store.get_last_session_summary("u1") == "test"
 
 
+def test_connection_pragmas(store):
+    with store._get_conn() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
 def test_messages(store):
     sid = store.create_session("u1")
     store.add_message(sid, "user", "hello")
@@ -47,6 +55,28 @@ def test_messages(store):
     assert msgs[0]["role"] == "user"
 
 
+def test_add_messages_bulk(store):
+    sid = store.create_session("u1")
+    store.add_messages_bulk(
+        sid,
+        [
+            ("user", "hello", None, None),
+            ("assistant", "", '[{"id": "c1"}]', None),
+            ("tool", "ok", None, "c1"),
+        ],
+        token_count=42,
+    )
+    msgs = store.get_session_messages(sid)
+    assert [m["role"] for m in msgs] == ["user", "assistant", "tool"]
+    assert msgs[2]["tool_call_id"] == "c1"
+    assert store.get_session(sid)["token_count"] == 42
+    assert store.get_session_messages_for_history(sid) == [
+        ("user", "hello", None, None),
+        ("assistant", "", '[{"id": "c1"}]', None),
+        ("tool", "ok", None, "c1"),
+    ]
+
+
 def test_agent_memory(store):
     store.write_memory("key1", "val1")
     assert store.read_memory("key1") == "val1"
@@ -108,6 +138,34 @@ def test_list_users(store):
     assert u1["channels"][0]["channel"] == "telegram"
 
 
+def test_find_user_by_name_or_id(store):
+    """Exact user_id wins; names match case-insensitively, including non-ASCII."""
+    store.get_or_create_user("zynp", name="Zeynep")
+    store.get_or_create_user("c1", name="Çağrı")
+    store.get_or_create_user("a1", name="Ali")
+    store.get_or_create_user("a2", name="ALI")
+
+    assert store.find_user_by_name_or_id("zynp") == [{"user_id": "zynp", "name": "Zeynep"}]
+    assert store.find_user_by_name_or_id("zeynep")[0]["user_id"] == "zynp"
+    assert store.find_user_by_name_or_id("çağrı")[0]["user_id"] == "c1"
+    assert len(store.find_user_by_name_or_id("ali")) == 2
+    assert store.find_user_by_name_or_id("nobody") == []
+
+
+def test_name_lower_backfilled_on_migrate(tmp_path):
+    """Users created before the name_lower column get it filled on open."""
+    import sqlite3
+
+    path = str(tmp_path / "legacy.db")
+    store = MemoryStore(path)
+    store.get_or_create_user("u1", name="Zeynep")
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE users SET name_lower = NULL")
+
+    reopened = MemoryStore(path)
+    assert reopened.find_user_by_name_or_id("ZEYNEP")[0]["user_id"] == "u1"
+
+
 def test_get_user_channels(store):
     """get_user_channels returns channel links for a user."""
     store.link_channel("u1", "telegram", "111")
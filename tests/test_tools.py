@@ -1,6 +1,8 @@
 """Tests for graphbot.agent.tools (Faz 3)."""
 
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from graphbot.agent.tools import ToolRegistry, make_tools
@@ -38,6 +40,14 @@ def test_memory_tools_created(store):
     assert "remove_user_preference" in names
 
 
+def test_memory_tools_built_once_per_store(store, tmp_path):
+    first = make_memory_tools(store)
+    again = make_memory_tools(store)
+    assert again == first and again is not first
+    other = make_memory_tools(MemoryStore(str(tmp_path / "other.db")))
+    assert other[0] is not first[0]
+
+
 def test_save_and_get_note(store):
     tools = make_memory_tools(store)
     save = next(t for t in tools if t.name == "save_user_note")
@@ -69,6 +79,19 @@ def test_favorites_crud(store):
     assert "No favorites" in result
 
 
+def test_memory_reads_see_store_writes(store):
+    """Writes made outside the tools show up on the next read."""
+    tools = {t.name: t for t in make_memory_tools(store)}
+
+    assert "No preferences" in tools["get_user_preferences"].invoke({"user_id": "u1"})
+    store.update_preferences("u1", {"tone": "dry"})
+    assert "tone: dry" in tools["get_user_preferences"].invoke({"user_id": "u1"})
+
+    assert "No favorites" in tools["get_favorites"].invoke({"user_id": "u1"})
+    store.add_favorite("u1", "i1", "Dune")
+    assert "Dune" in tools["get_favorites"].invoke({"user_id": "u1"})
+
+
 # --- Search tools ---
 
 def test_search_mock():
@@ -79,6 +102,33 @@ def test_search_mock():
     assert "mock" in result.lower()
 
 
+def test_get_current_time_timezones():
+    get_time = next(t for t in make_search_tools() if t.name == "get_current_time")
+    result = get_time.invoke({"timezone_name": "UTC"})
+    assert result.endswith("timezone: UTC")
+    day = result.split("(")[1].split(")")[0]
+    assert day in {"Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"}
+    # Unknown names fall back to Istanbul time but echo the requested name
+    assert get_time.invoke({"timezone_name": "Mars/Base"}).endswith("timezone: Mars/Base")
+
+
+def test_tz_lookup_is_dst_aware():
+    from datetime import datetime
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    from graphbot.agent.tools.search import _tz
+
+    try:
+        ZoneInfo("Europe/Berlin")
+    except ZoneInfoNotFoundError:
+        pytest.skip("no tz database available")
+    berlin = _tz("Europe/Berlin")
+    assert datetime(2025, 1, 15, tzinfo=berlin).utcoffset().total_seconds() == 3600
+    assert datetime(2025, 7, 15, tzinfo=berlin).utcoffset().total_seconds() == 7200
+    assert _tz("Mars/Base") is _tz("Europe/Istanbul")
+    assert _tz("../etc/passwd") is _tz("Europe/Istanbul")
+
+
 # --- Filesystem tools ---
 
 def test_filesystem_read_write(cfg, tmp_path):
@@ -97,6 +147,54 @@ def test_filesystem_read_write(cfg, tmp_path):
     assert "hello.txt" in ls_result
 
 
+def test_filesystem_read_truncates_large_file(cfg, tmp_path):
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    big = ws / "big.log"
+    big.write_text("x" * 60_000)
+    read = next(t for t in make_filesystem_tools(cfg) if t.name == "read_file")
+
+    result = read.invoke({"path": str(big)})
+    assert result.startswith("x" * 50_000)
+    assert result.endswith("... truncated (60000 bytes on disk)")
+
+
+def test_filesystem_edit_unique_match(cfg, tmp_path):
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    f = ws / "a.txt"
+    edit = next(t for t in make_filesystem_tools(cfg) if t.name == "edit_file")
+
+    f.write_text("foo bar foo")
+    result = edit.invoke({"path": str(f), "old_text": "foo", "new_text": "baz"})
+    assert "must be unique" in result
+    assert edit.invoke({"path": str(f), "old_text": "qux", "new_text": "x"}) == (
+        "old_text not found in file."
+    )
+
+    f.write_text("aaa bar")
+    result = edit.invoke({"path": str(f), "old_text": "bar", "new_text": "baz"})
+    assert result == "Edit applied successfully."
+    assert f.read_text() == "aaa baz"
+    # Overlapping occurrences do not count as a second match
+    result = edit.invoke({"path": str(f), "old_text": "aa", "new_text": "b"})
+    assert result == "Edit applied successfully."
+    assert f.read_text() == "ba baz"
+
+
+def test_human_size_units():
+    from graphbot.agent.tools.filesystem import _human_size
+
+    assert _human_size(0) == "0B"
+    assert _human_size(1023) == "1023B"
+    assert _human_size(1024) == "1.0KB"
+    assert _human_size(1536) == "1.5KB"
+    assert _human_size((1 << 20) - 1) == "1024.0KB"
+    assert _human_size(1 << 20) == "1.0MB"
+    assert _human_size(5 * (1 << 30)) == "5.0GB"
+    assert _human_size(2048 * (1 << 40)) == "2048.0TB"
+
+
 def test_filesystem_sandbox(cfg, tmp_path):
     tools = make_filesystem_tools(cfg)
     read = next(t for t in tools if t.name == "read_file")
@@ -104,6 +202,17 @@ def test_filesystem_sandbox(cfg, tmp_path):
     assert "denied" in result.lower() or "outside" in result.lower()
 
 
+def test_filesystem_sandbox_rejects_prefix_sibling(cfg, tmp_path):
+    """A sibling sharing the workspace name as a prefix is outside it."""
+    sibling = tmp_path / "workspace-evil"
+    sibling.mkdir()
+    (sibling / "secret.txt").write_text("nope")
+    tools = make_filesystem_tools(cfg)
+    read = next(t for t in tools if t.name == "read_file")
+    result = read.invoke({"path": str(sibling / "secret.txt")})
+    assert "denied" in result.lower()
+
+
 # --- Shell tools ---
 
 @pytest.mark.asyncio
@@ -114,12 +223,42 @@ async def test_shell_exec(cfg):
     assert "hello" in result
 
 
+@pytest.mark.asyncio
+async def test_shell_large_output_capped(cfg):
+    from graphbot.agent.tools.shell import MAX_OUTPUT
+
+    exec_cmd = make_shell_tools(cfg)[0]
+    result = await exec_cmd.ainvoke({"command": "head -c 1000000 /dev/zero | tr '\\0' x; exit 3"})
+    assert result.startswith("[exit code: 3]\n" + "x" * 100)
+    assert result.endswith("... truncated (1000000 bytes)")
+    assert result.split("\n")[1] == "x" * MAX_OUTPUT
+
+
 @pytest.mark.asyncio
 async def test_shell_deny(cfg):
     tools = make_shell_tools(cfg)
     exec_cmd = tools[0]
     result = await exec_cmd.ainvoke({"command": "rm -rf /"})
     assert "blocked" in result.lower()
+    result = await exec_cmd.ainvoke({"command": "RM -Rf /"})
+    assert "blocked" in result.lower()
+
+
+@pytest.mark.parametrize("command", [
+    "rm -rf /", "rm -r x", "del /f a", "rmdir /S b", "mkfs.ext4 /dev/sda",
+    "dd if=/dev/zero of=x", "echo x > /dev/sda", "sudo reboot", ":(){ :|:& };:",
+    "echo hi", "ls -la", "rmdir empty", "format_output.py",
+    "RM -R x", "DEL /Q a", "SHUTDOWN /s",
+])
+def test_shell_deny_regex_matches_patterns(command):
+    """The combined deny regex agrees with the (case-insensitive) individual patterns."""
+    from graphbot.agent.tools.shell import DENY_PATTERNS, DENY_RE
+
+    expected = any(p.search(command) for p in DENY_PATTERNS)
+    assert bool(DENY_RE.search(command)) is expected
+
+    for pattern in DENY_PATTERNS:
+        assert bool(pattern.search(command)) is bool(pattern.search(command.lower()))
 
 
 # --- Web tools ---
@@ -132,6 +271,271 @@ def test_web_tools_created(cfg):
     assert "web_fetch" in names
 
 
+def test_tool_factories_cached_per_dependency(cfg):
+    """Web/shell tools are built once per config, search tools per retriever."""
+    for factory in (make_web_tools, make_shell_tools):
+        first = factory(cfg)
+        assert factory(cfg) == first
+        assert factory(Config())[0] is not first[0]
+    assert make_search_tools() == make_search_tools()
+    # get_current_time does not depend on the retriever and is shared
+    other = make_search_tools(MagicMock())
+    assert other[0] is not make_search_tools()[0]
+    assert other[2] is make_search_tools()[2]
+
+
+def test_identity_memo_bounded_and_identity_keyed():
+    from graphbot.agent.tools.memo import IdentityMemo
+
+    memo = IdentityMemo(max_size=2)
+    a, b, c = object(), object(), object()
+    built = []
+
+    def build(dep):
+        return lambda: built.append(dep) or [dep]
+
+    assert memo.get((a,), build(a)) is memo.get((a,), build(a))
+    assert memo.get((a,), build(a), extra="m2") is not memo.get((a,), build(a))
+    memo.get((b,), build(b))
+    memo.get((c,), build(c))  # evicts the oldest entry
+    assert len(memo) == 2
+    memo.get((a,), build(a))
+    assert built == [a, a, b, c, a]
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_reuses_shared_client(cfg):
+    import httpx
+
+    from graphbot.agent.tools import web
+
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"location": "/new"})
+        return httpx.Response(200, text="<p>hello</p>", headers={"content-type": "text/html"})
+
+    web.clear_web_cache()
+    await web.close_client()
+    client = web._get_client()
+    client._transport = httpx.MockTransport(handler)
+    fetch = next(t for t in make_web_tools(cfg) if t.name == "web_fetch")
+
+    assert await fetch.ainvoke({"url": "https://example.com/old"}) == "hello"
+    assert await fetch.ainvoke({"url": "https://example.com/new"}) == "hello"
+    assert web._get_client() is client
+
+    await web.close_client()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_caches_successes_only(cfg):
+    import httpx
+
+    from graphbot.agent.tools import web
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/down":
+            return httpx.Response(503)
+        return httpx.Response(200, text="fresh", headers={"content-type": "text/plain"})
+
+    web.clear_web_cache()
+    await web.close_client()
+    web._get_client()._transport = httpx.MockTransport(handler)
+    fetch = next(t for t in make_web_tools(cfg) if t.name == "web_fetch")
+
+    assert await fetch.ainvoke({"url": "https://example.com/ok"}) == "fresh"
+    assert await fetch.ainvoke({"url": "https://example.com/ok"}) == "fresh"
+    assert calls == ["/ok"]
+
+    assert (await fetch.ainvoke({"url": "https://example.com/down"})).startswith("Fetch error")
+    await fetch.ainvoke({"url": "https://example.com/down"})
+    assert calls == ["/ok", "/down", "/down"]
+
+    web.clear_web_cache()
+    await fetch.ainvoke({"url": "https://example.com/ok"})
+    assert calls[-1] == "/ok" and len(calls) == 4
+    await web.close_client()
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_stops_streaming_at_budget(cfg):
+    import httpx
+
+    from graphbot.agent.tools import web
+
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1)
+            yield b"x" * 1000
+
+    def handler(request):
+        return httpx.Response(200, content=body(), headers={"content-type": "text/plain"})
+
+    web.clear_web_cache()
+    await web.close_client()
+    web._get_client()._transport = httpx.MockTransport(handler)
+    fetch = next(t for t in make_web_tools(cfg) if t.name == "web_fetch")
+
+    text = await fetch.ainvoke({"url": "https://example.com/big", "max_chars": 500})
+    assert text.startswith("x" * 500 + "\n\n... truncated (page over")
+    assert len(sent) < 10
+    await web.close_client()
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_returns_partial_body_on_slow_trickle(cfg, monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from graphbot.agent.tools import web
+
+    async def body():
+        yield b"first part"
+        await asyncio.sleep(5)
+        yield b" never sent"
+
+    class TrickleTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            return httpx.Response(200, content=body(), headers={"content-type": "text/plain"})
+
+    monkeypatch.setattr(web, "FETCH_TIMEOUT", 0.2)
+    web.clear_web_cache()
+    await web.close_client()
+    web._get_client()._transport = TrickleTransport()
+    fetch = next(t for t in make_web_tools(cfg) if t.name == "web_fetch")
+
+    text = await fetch.ainvoke({"url": "https://example.com/slow"})
+    assert text.startswith("first part\n\n... truncated (read timed out")
+    assert not web._FETCH_CACHE
+    await web.close_client()
+
+
+@pytest.mark.asyncio
+async def test_web_search_parallel_fallback(cfg, monkeypatch):
+    import asyncio
+
+    from graphbot.agent.tools import web
+
+    delays = {"ddg": 0.0, "brave": 0.0}
+    results = {"ddg": "ddg results", "brave": "brave results"}
+    cancelled = []
+
+    def fake(name):
+        async def search(*args, **kwargs):
+            try:
+                await asyncio.sleep(delays[name])
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+            return results[name]
+        return search
+
+    monkeypatch.setattr(web, "_ddg_search", fake("ddg"))
+    monkeypatch.setattr(web, "_brave_search", fake("brave"))
+    monkeypatch.setattr(web, "PARALLEL_HEAD_START", 0.1)
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+    monkeypatch.delenv("MOONSHOT_API_KEY", raising=False)
+
+    # ddg finishing within its head start is preferred over a faster brave
+    delays.update(ddg=0.05, brave=0.0)
+    assert await web._search_parallel("q", 5, "key") == "ddg results"
+
+    # a hanging ddg is cancelled once brave answers after the head start
+    delays.update(ddg=10, brave=0.0)
+    assert await web._search_parallel("q", 5, "key") == "brave results"
+    assert cancelled == ["ddg"]
+
+    # a failed ddg does not hold back brave
+    results["ddg"] = None
+    delays.update(ddg=0.0, brave=0.01)
+    assert await web._search_parallel("q", 5, "key") == "brave results"
+
+    results["brave"] = "Search error: 500"
+    assert await web._search_parallel("q", 5, "key") == "Search error: 500"
+    assert await web._search_parallel("q", 5, "") == (
+        "Web search unavailable: all search providers failed."
+    )
+
+    cfg.tools.web.parallel_fallback = True
+    cfg.tools.web.search_api_key = "key"
+    results["brave"] = "brave again"
+    web.clear_web_cache()
+    search = next(t for t in web._build_web_tools(cfg) if t.name == "web_search")
+    assert await search.ainvoke({"query": "q"}) == "brave again"
+
+
+def test_format_search_results():
+    from graphbot.agent.tools.web import _format_results
+
+    results = [{"title": "A", "url": "u1", "content": "c" * 300}, {"url": "u2"}]
+    assert _format_results("q", results, "url", "content", max_snippet=200) == (
+        f"Results for: q\n\n1. A\n   u1\n   {'c' * 200}\n\n2. No title\n   u2\n"
+    )
+
+
+def test_html_to_text(monkeypatch):
+    from graphbot.agent.tools import web
+    from graphbot.agent.tools.web import _html_to_text
+
+    monkeypatch.setattr(web, "HTMLParser", None)  # regex fallback
+
+    html = (
+        "<html><STYLE>body{}\n</style><script>var a = '<p>';\n</SCRIPT>"
+        "<H1 class=a>Title <b>bold</b></H1><p>A &amp; B &lt;tag&gt;</p>"
+        "<div>  spaced   out  </div><br/><ul><li>one</li><li>two&nbsp;&quot;q&#39;</li></ul>"
+        "\n\n\n\nend</html>"
+    )
+    assert _html_to_text(html) == (
+        "Title bold\nA & B <tag>\nspaced out\n\none\ntwo \"q'\n\nend"
+    )
+    assert _html_to_text("plain") == "plain"
+    assert _html_to_text("  a   b &lt;\n\n\n\nc ") == "a b <\n\nc"
+    assert _html_to_text("<p>caf&eacute; &#8364;5 &#x2014; &copy;</p>") == "café €5 — ©"
+
+
+def test_html_to_text_with_selectolax():
+    pytest.importorskip("selectolax")
+    from graphbot.agent.tools.web import _html_to_text
+
+    html = (
+        "<html><head><title>Page</title><style>body{}</style></head><body>"
+        "<script>var a = '<p>';</script>"
+        "<h1>Title <b>bold</b></h1><p>A &amp; B &lt;tag&gt;</p>"
+        "<div>  spaced   out  </div><ul><li>one</li><li>two&nbsp;x</li></ul>end</body></html>"
+    )
+    assert _html_to_text(html) == "Page\n\nTitle bold\nA & B <tag>\nspaced out\none\ntwo x\nend"
+
+
+@pytest.mark.parametrize("html", [
+    (
+        "<html><head><title>Page &amp; co</title><style>body{}</style></head><body>"
+        "<h1>Title <b>bold</b></h1><p>A &amp; B &lt;tag&gt;</p><div> spaced   out </div>"
+        "<ul><li>one</li><li>two&nbsp;x</li></ul>end</body></html>"
+    ),
+    (
+        "<html><STYLE>body{}\n</style><script>var a = '<p>';\n</SCRIPT>"
+        "<H1 class=a>Title</H1><div>x</div><br/><ul><li>one</li></ul>\n\n\n\nend</html>"
+    ),
+    "<title>T</title>body text",
+    "<p>caf&eacute; &#8364;5 &#x2014; &copy;</p>",
+])
+def test_html_to_text_paths_agree(html, monkeypatch):
+    """selectolax and the regex fallback produce the same text."""
+    pytest.importorskip("selectolax")
+    from graphbot.agent.tools import web
+
+    dom = web._html_to_text(html)
+    monkeypatch.setattr(web, "HTMLParser", None)
+    assert web._html_to_text(html) == dom
+
+
 # --- Integration ---
 
 def test_make_tools_returns_registry(cfg, store):
@@ -165,3 +569,119 @@ def test_make_tools_returns_registry(cfg, store):
     catalog = registry.get_catalog()
     assert len(catalog) == len(tools)
     assert all("name" in item and "group" in item for item in catalog)
+
+
+def _named_tool(name):
+    from unittest.mock import MagicMock
+
+    t = MagicMock()
+    t.name = name
+    t.description = f"{name} tool\nDetails."
+    return t
+
+
+def test_registry_group_resolution():
+    registry = ToolRegistry()
+    registry.register_unavailable("delegation", ["delegate"], requires=["worker"])
+    registry.register_group("web", [_named_tool("web_search"), _named_tool("web_fetch")])
+    registry.register_group("shell", [_named_tool("exec_command")])
+
+    assert registry.get_tools_for_groups(["web", "shell"]) == {
+        "web_search", "web_fetch", "exec_command",
+    }
+    assert registry.get_tools_for_groups(["delegation", "missing"]) == frozenset()
+
+    # Re-registering a group replaces its placeholders / previous tools
+    registry.register_group("delegation", [_named_tool("delegate")])
+    registry.register_group("web", [_named_tool("web_search")])
+    assert registry.get_tools_for_groups(["delegation", "web"]) == {"delegate", "web_search"}
+
+
+def test_registry_catalog_cached_per_version():
+    registry = ToolRegistry()
+    registry.register_group("web", [_named_tool("web_search")])
+    catalog = registry.get_catalog()
+    assert catalog == [{
+        "name": "web_search", "group": "web", "description": "web_search tool",
+        "available": True, "requires": [],
+    }]
+    assert registry.get_catalog() is catalog
+
+    registry.register_group("shell", [_named_tool("exec_command")])
+    assert [c["name"] for c in registry.get_catalog()] == ["exec_command", "web_search"]
+
+
+def test_registry_validate_roles():
+    registry = ToolRegistry()
+    registry.register_group("web", [_named_tool("web_search")])
+    roles = {"roles": {"guest": {"tool_groups": ["web", "shell"]}}}
+    assert registry.validate_roles(roles) == ["Role 'guest' references unknown group 'shell'"]
+
+    registry.register_unavailable("shell", ["exec_command"], requires=["sandbox"])
+    assert registry.validate_roles(roles) == []
+
+    # Empty YAML sections (as permissions.py tolerates) are not errors
+    assert registry.validate_roles({"roles": None}) == []
+    assert registry.validate_roles({"roles": {"guest": None, "member": {"tool_groups": None}}}) == []
+
+
+def test_make_tools_reuses_retriever(cfg, store, monkeypatch):
+    import sys
+    import types
+
+    import graphbot.agent.tools as tools_mod
+
+    built = []
+
+    class FakeRetriever:
+        def __init__(self, rag_config):
+            built.append(rag_config)
+
+    monkeypatch.setitem(
+        sys.modules, "graphbot.rag.retriever",
+        types.SimpleNamespace(SemanticRetriever=FakeRetriever),
+    )
+    monkeypatch.setattr(tools_mod, "_RETRIEVERS", {})
+    rag_cfg = object()
+    monkeypatch.setattr(cfg, "rag", rag_cfg, raising=False)
+
+    make_tools(cfg, store)
+    make_tools(cfg, store)
+    assert built == [rag_cfg]
+
+
+def test_make_tools_missing_group_dependency(cfg, store, monkeypatch):
+    import importlib
+
+    real_import = importlib.import_module
+
+    def fake_import(name, *args):
+        if name == "graphbot.agent.tools.web":
+            raise ImportError("No module named 'httpx'", name="httpx")
+        return real_import(name, *args)
+
+    monkeypatch.setattr(importlib, "import_module", fake_import)
+    registry = make_tools(cfg, store)
+    assert registry.get_tools_for_groups(["web"]) == frozenset()
+    assert "web" in registry.get_groups_summary()
+    assert "exec_command" in registry
+
+
+@pytest.mark.parametrize("error", [
+    ImportError("cannot import name 'x' from 'graphbot.core.config.schema'",
+                name="graphbot.core.config.schema"),
+    ImportError("something else"),
+])
+def test_make_tools_internal_import_error_propagates(cfg, store, monkeypatch, error):
+    import importlib
+
+    real_import = importlib.import_module
+
+    def fake_import(name, *args):
+        if name == "graphbot.agent.tools.web":
+            raise error
+        return real_import(name, *args)
+
+    monkeypatch.setattr(importlib, "import_module", fake_import)
+    with pytest.raises(ImportError):
+        make_tools(cfg, store)
@@ -36,6 +36,32 @@ def test_chat_id_to_phone_no_suffix():
     assert WAHAClient.chat_id_to_phone("905551234567") == "905551234567"
 
 
+@pytest.mark.asyncio
+async def test_waha_clients_share_http_client():
+    """All WAHAClient instances send through one pooled HTTP client."""
+    import httpx
+
+    from graphbot.core.channels import waha_client
+
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.headers.get("x-api-key")))
+        return httpx.Response(201, json={"id": "m1"})
+
+    await waha_client.close_client()
+    client = waha_client._get_client()
+    client._transport = httpx.MockTransport(handler)
+
+    assert await WAHAClient("http://waha", api_key="k1").send_text("1@c.us", "a") == {"id": "m1"}
+    await WAHAClient("http://waha").send_text("1@c.us", "b")
+
+    assert waha_client._get_client() is client
+    assert seen == [("/api/sendText", "k1"), ("/api/sendText", None)]
+    await waha_client.close_client()
+    assert client.is_closed
+
+
 # ── Message splitting ─────────────────────────────────────
 
 